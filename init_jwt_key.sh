@@ -1,21 +1,50 @@
 #!/bin/bash
 set -e
 
+# Алгоритм: RS256 (типово), ES256 або EdDSA; має збігатися з JWT_ALGORITHM
+ALGORITHM="${1:-${JWT_ALGORITHM:-RS256}}"
+
 # Створити каталог для сертифікатів
 mkdir -p src/certs
 
 # Файли ключів
 PRIVATE_KEY_FILE="src/certs/jwt-private.pem"
 PUBLIC_KEY_FILE="src/certs/jwt-public.pem"
+PREVIOUS_KEY_FILE="src/certs/jwt-previous.pem"
+
+# Попередній публічний ключ лишається для перевірки вже виданих токенів
+if [ -f "$PUBLIC_KEY_FILE" ]; then
+    cp "$PUBLIC_KEY_FILE" "$PREVIOUS_KEY_FILE"
+    chmod 644 "$PREVIOUS_KEY_FILE"
+    echo "Previous public key saved to $PREVIOUS_KEY_FILE, add it to JWT_VERIFY_KEYS"
+fi
 
-# Генерація приватного ключа
-openssl genrsa -out "$PRIVATE_KEY_FILE" 2048
+# Генерація приватного ключа у тимчасовий файл, щоб не підхопити його наполовину
+TMP_KEY_FILE="$PRIVATE_KEY_FILE.tmp"
+case "$ALGORITHM" in
+    RS256)
+        openssl genrsa -out "$TMP_KEY_FILE" 2048
+        ;;
+    ES256)
+        openssl genpkey -algorithm EC -pkeyopt ec_paramgen_curve:P-256 -out "$TMP_KEY_FILE"
+        ;;
+    EdDSA)
+        openssl genpkey -algorithm ed25519 -out "$TMP_KEY_FILE"
+        ;;
+    *)
+        echo "Unsupported algorithm '$ALGORITHM' (RS256, ES256, EdDSA)" >&2
+        exit 1
+        ;;
+esac
 
 # Генерація публічного ключа
-openssl rsa -in "$PRIVATE_KEY_FILE" -pubout -out "$PUBLIC_KEY_FILE"
+openssl pkey -in "$TMP_KEY_FILE" -pubout -out "$PUBLIC_KEY_FILE.tmp"
+# Спершу публічний: поки пара не збігається, сервіс лишає попередні ключі
+mv "$PUBLIC_KEY_FILE.tmp" "$PUBLIC_KEY_FILE"
+mv "$TMP_KEY_FILE" "$PRIVATE_KEY_FILE"
 
 # Права доступу
 chmod 600 "$PRIVATE_KEY_FILE"
 chmod 644 "$PUBLIC_KEY_FILE"
 
-echo "Create JWT keys"
+echo "Create JWT keys ($ALGORITHM)"
@@ -15,6 +15,7 @@ T = TypeVar("T")
 class IRefreshToken(ICreatedAt, Protocol):
     id: int
     token: str
+    token_digest: bytes
     user_id: int
     revoked: bool
 
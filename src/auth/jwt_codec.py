@@ -1,23 +1,243 @@
+import base64
+import hashlib
+import logging
+import signal
 from datetime import datetime, timedelta, timezone
+from functools import cache
+from pathlib import Path
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Any, Callable
 
-from typing import Any
 import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
 from src.auth.schemas import TokenCreate, TokenInfo
+from src.auth.token_cache import verified_tokens
 from src.config import settings
 
+log = logging.getLogger(__name__)
+
+
+# EdDSA (Ed25519) і ES256 підписують на порядки швидше за RS256
+ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+
+def parse_key(pem: str | bytes, algorithm: str) -> Any:
+    """PEM -> об'єкт ключа cryptography; PyJWT використовує його без повторного розбору."""
+    return jwt.get_algorithm_by_name(algorithm).prepare_key(pem)
+
+
+def key_algorithm(public_key: Any) -> str:
+    """Алгоритм JWT за типом публічного ключа."""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(
+        public_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    raise ValueError(f"Unsupported JWT key type {type(public_key).__name__}")
+
+
+def key_id(public_key: Any) -> str:
+    """`kid`: відбиток публічного ключа, однаковий на всіх воркерах."""
+    der = public_key.public_bytes(
+        serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    digest = hashlib.sha256(der).digest()[:12]
+    return base64.urlsafe_b64encode(digest).decode()
+
+
+class JWTKeys:
+    """
+    Розібрані ключі підпису. Якщо задані шляхи до PEM-файлів, раз на
+    `check_interval` секунд порівнює їх mtime і перечитує змінені;
+    `request_reload()` (напр. з обробника SIGHUP) змушує перечитати на
+    наступному зверненні. Невдале перечитування лишає попередні ключі.
+
+    `verify_key_paths` — додаткові публічні ключі (напр. попередній ключ
+    під час ротації): токени з їхнім `kid` теж проходять перевірку.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        public_key_path: Path | None = None,
+        private_key_path: Path | None = None,
+        check_interval: float = 5.0,
+        on_reload: Callable[[], Any] | None = None,
+        verify_key_paths: tuple[Path, ...] = (),
+    ):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm '{algorithm}'")
+        self.algorithm = algorithm
+        self.public_key_path = public_key_path
+        self.private_key_path = private_key_path
+        self.verify_key_paths = tuple(verify_key_paths)
+        self.check_interval = check_interval
+        self.on_reload = on_reload
+        self.public: Any = None
+        # (приватний ключ, kid) — один кортеж, що замінюється одним присвоєнням:
+        # encode з іншого потоку не побачить ключ однієї пари з kid іншої
+        self.signer: tuple[Any, str] | None = None
+        # kid -> (алгоритм, публічний ключ)
+        self.verifiers: dict[str, tuple[str, Any]] = {}
+        self._mtimes: tuple[float, ...] | None = None
+        self._checked_at = monotonic()
+        self._force = False
+        self._lock = Lock()
+        self.loads = 0
+        self.reloads = 0
+        self.load_errors = 0
+        self.read_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.loaded_at: datetime | None = None
+        if public_key_path is not None:
+            self.load()
+
+    @classmethod
+    def from_pem(
+        cls,
+        public_pem: str | bytes,
+        private_pem: str | bytes,
+        algorithm: str,
+        verify_pems: tuple[str | bytes, ...] = (),
+    ) -> "JWTKeys":
+        """Ключі з пам'яті, без файлів і перечитування."""
+        keys = cls(algorithm)
+        start = perf_counter()
+        keys._set(public_pem, private_pem, verify_pems)
+        keys.parse_seconds = perf_counter() - start
+        keys.loads = 1
+        keys.loaded_at = datetime.now(timezone.utc)
+        return keys
+
+    def load(self):
+        """Читає й розбирає всі файли; ключі змінюються лише разом."""
+        start = perf_counter()
+        mtimes = self._all_mtimes()
+        public_pem = self.public_key_path.read_bytes()
+        private_pem = self.private_key_path.read_bytes()
+        verify_pems = tuple(path.read_bytes() for path in self.verify_key_paths)
+        read = perf_counter()
+        self._set(public_pem, private_pem, verify_pems)
+        self._mtimes = mtimes
+        self.loads += 1
+        self.read_seconds = read - start
+        self.parse_seconds = perf_counter() - read
+        self.loaded_at = datetime.now(timezone.utc)
+
+    def _set(self, public_pem, private_pem, verify_pems):
+        private = parse_key(private_pem, self.algorithm)
+        # публічний ключ і kid — з приватного: підпис і kid завжди з однієї пари
+        public = private.public_key()
+        if key_id(parse_key(public_pem, self.algorithm)) != key_id(public):
+            # напр. файли ключів замінено не одночасно — лишаємо попередню пару
+            raise ValueError("JWT public key does not match the private key")
+        verifiers = {}
+        for pem in verify_pems:
+            key = serialization.load_pem_public_key(
+                pem if isinstance(pem, bytes) else pem.encode()
+            )
+            verifiers[key_id(key)] = (key_algorithm(key), key)
+        kid = key_id(public)
+        verifiers[kid] = (self.algorithm, public)
+        self.verifiers = verifiers
+        self.public = public
+        self.signer = (private, kid)
+
+    @property
+    def private(self) -> Any:
+        return self.signer[0] if self.signer else None
+
+    @property
+    def kid(self) -> str | None:
+        return self.signer[1] if self.signer else None
+
+    def verifier(self, kid: str | None) -> tuple[str, Any]:
+        """Алгоритм і ключ для токена; без `kid` — поточний ключ (старі токени)."""
+        if kid is None:
+            return self.algorithm, self.public
+        verifier = self.verifiers.get(kid)
+        if verifier is None:
+            raise jwt.InvalidTokenError(f"Unknown key id '{kid}'")
+        return verifier
+
+    def request_reload(self):
+        self._force = True
+
+    def refresh(self):
+        """Перечитує ключі, якщо файли змінились або це запитано явно."""
+        if self.public_key_path is None:
+            return
+        now = monotonic()
+        if not self._force and (
+            self.check_interval <= 0 or now - self._checked_at < self.check_interval
+        ):
+            return
+        with self._lock:
+            if not self._force and now - self._checked_at < self.check_interval:
+                return  # інший потік уже перевірив
+            self._checked_at = now
+            force, self._force = self._force, False
+            try:
+                mtimes = self._all_mtimes()
+                if not force and mtimes == self._mtimes:
+                    return
+                self.load()
+            except (OSError, ValueError, jwt.PyJWTError) as e:
+                # напр. файл ще дописується — спробуємо на наступній перевірці
+                self.load_errors += 1
+                log.exception(f"JWT keys reload failed, keeping previous keys: {e}")
+                return
+            self.reloads += 1
+            log.info("JWT keys reloaded")
+        if self.on_reload is not None:
+            self.on_reload()
+
+    def _all_mtimes(self) -> tuple[float, ...]:
+        paths = (self.public_key_path, self.private_key_path, *self.verify_key_paths)
+        return tuple(path.stat().st_mtime for path in paths)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "algorithm": self.algorithm,
+            "kid": self.kid,
+            "verify_kids": sorted(self.verifiers),
+            "loads": self.loads,
+            "reloads": self.reloads,
+            "load_errors": self.load_errors,
+            "read_seconds": self.read_seconds,
+            "parse_seconds": self.parse_seconds,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "check_interval": self.check_interval,
+        }
+
 
 class JWTAuthCodec:
-    def __init__(self, public_key, private_key, algorithm: str, expire_minutes: int):
-        self.__public_key = public_key
-        self.__private_key = private_key
+    def __init__(
+        self,
+        public_key=None,
+        private_key=None,
+        algorithm: str = "RS256",
+        expire_minutes: int = 15,
+        keys: JWTKeys | None = None,
+    ):
+        # PEM розбирається один раз тут, а не в кожному encode/decode
+        self.keys = keys or JWTKeys.from_pem(public_key, private_key, algorithm)
         self.__algorithm = algorithm
         self.__expire_minutes = expire_minutes
 
     def decode(self, token: str | bytes):
+        self.keys.refresh()
+        # алгоритм береться з ключа, а не із заголовка токена
+        algorithm, key = self.keys.verifier(jwt.get_unverified_header(token).get("kid"))
         payload = jwt.decode(
             token,
-            self.__public_key,
-            algorithms=self.__algorithm,
+            key,
+            algorithms=[algorithm],
         )
         payload["sub"] = int(payload["sub"])
         payload = TokenInfo(**payload)
@@ -30,7 +250,8 @@ class JWTAuthCodec:
         payload: TokenCreate,
         expire_minutes: int | None = None,
     ):
-        to_encodes = payload.model_dump()
+        self.keys.refresh()
+        to_encodes = payload.model_dump(exclude_none=True)
         to_encodes["sub"] = str(payload.sub)
         now = datetime.now(timezone.utc)
         if expire_minutes:
@@ -43,21 +264,40 @@ class JWTAuthCodec:
             iat=now,
         )
 
-        return jwt.encode(to_encodes, self.__private_key, self.__algorithm)
+        private, kid = self.keys.signer
+        return jwt.encode(to_encodes, private, self.__algorithm, headers={"kid": kid})
 
 
+@cache
 def get_jwt_codec():
+    """Один codec на процес: ключі читаються при першому виклику, далі — лише при зміні."""
     s = settings.auth_jwt
-
-    with open(s.public_key_path, "r") as pub_f:
-        public_key = pub_f.read()
-
-    with open(s.private_key_path, "r") as priv_f:
-        private_key = priv_f.read()
-
+    keys = JWTKeys(
+        s.algorithm,
+        public_key_path=s.public_key_path,
+        private_key_path=s.private_key_path,
+        check_interval=s.key_reload_seconds,
+        verify_key_paths=tuple(s.verify_key_paths),
+        # токени, перевірені старим ключем, більше не вважаються перевіреними
+        on_reload=verified_tokens.clear,
+    )
     return JWTAuthCodec(
-        public_key=public_key,
-        private_key=private_key,
         algorithm=s.algorithm,
         expire_minutes=s.access_token_expire_minutes,
+        keys=keys,
     )
+
+
+def install_reload_signal(signum: int | None = getattr(signal, "SIGHUP", None)):
+    """`kill -HUP <pid>` перечитує ключі без перезапуску."""
+    if signum is None:
+        return
+
+    def handler(*_):
+        get_jwt_codec().keys.request_reload()
+
+    try:
+        signal.signal(signum, handler)
+    except ValueError:
+        # signal.signal доступний лише з головного потоку
+        log.warning("JWT key reload signal is not installed")
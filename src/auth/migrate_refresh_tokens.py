@@ -0,0 +1,196 @@
+"""
+Міграція наявної бази на пошук refresh-токенів за `token_digest`:
+
+    python -m src.auth.migrate_refresh_tokens [--batch-size 10000]
+
+Ідемпотентна: додає колонку, якщо її немає, дозаповнює порожні
+дайджести пачками (кожна — окрема транзакція, тож велику таблицю не
+блоковано надовго), зливає дублікати токенів, будує унікальний індекс
+(у PostgreSQL — CONCURRENTLY) і прибирає старий індекс по `token`.
+
+Невдалий CREATE INDEX CONCURRENTLY (напр. дублікат, вставлений уже після
+злиття) лишає індекс INVALID: повторний запуск видаляє його й будує знову,
+а старий індекс і NOT NULL чіпає лише після валідного унікального індексу.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import LargeBinary, bindparam, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.auth.utils import token_digest
+
+log = logging.getLogger(__name__)
+
+TABLE = "refresh_tokens"
+DIGEST_INDEX = "ix_refresh_tokens_token_digest"
+OLD_INDEX = "ix_refresh_tokens_token"
+
+
+async def add_digest_column(engine: AsyncEngine) -> bool:
+    async with engine.begin() as conn:
+        columns = await conn.run_sync(
+            lambda sync: {c["name"] for c in inspect(sync).get_columns(TABLE)}
+        )
+        if "token_digest" in columns:
+            return False
+        type_ = LargeBinary(32).compile(dialect=conn.dialect)
+        await conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN token_digest {type_}"))
+    return True
+
+
+async def backfill(engine: AsyncEngine, batch_size: int = 10_000) -> int:
+    """Дозаповнює дайджести за зростанням id; повертає кількість рядків."""
+    select_batch = text(
+        f"SELECT id, token FROM {TABLE} "
+        "WHERE token_digest IS NULL AND id > :last ORDER BY id LIMIT :limit"
+    )
+    update = text(f"UPDATE {TABLE} SET token_digest = :digest WHERE id = :row_id")
+    total, last = 0, 0
+    while True:
+        async with engine.begin() as conn:
+            rows = (
+                await conn.execute(select_batch, {"last": last, "limit": batch_size})
+            ).all()
+            if not rows:
+                return total
+            await conn.execute(
+                update,
+                [{"digest": token_digest(token), "row_id": id_} for id_, token in rows],
+            )
+        total += len(rows)
+        last = rows[-1][0]
+        log.info(f"{TABLE}: {total} digests filled")
+
+
+async def merge_duplicates(engine: AsyncEngine) -> int:
+    """
+    Однаковий токен міг бути записаний кілька разів (два логіни в одну
+    секунду до появи `jti`). Лишається найстаріший рядок; якщо хоч одну
+    копію відкликано, відкликаним вважається і він.
+    """
+    async with engine.begin() as conn:
+        digests = (
+            await conn.execute(
+                text(
+                    f"SELECT token_digest FROM {TABLE} "
+                    "GROUP BY token_digest HAVING count(*) > 1"
+                )
+            )
+        ).scalars().all()
+        if not digests:
+            return 0
+        rows = (
+            await conn.execute(
+                text(
+                    f"SELECT id, token_digest, revoked FROM {TABLE} "
+                    "WHERE token_digest IN :digests ORDER BY id"
+                ).bindparams(bindparam("digests", expanding=True)),
+                {"digests": digests},
+            )
+        ).all()
+        keep: dict[bytes, list] = {}
+        drop = []
+        for id_, digest, revoked in rows:
+            if digest in keep:
+                keep[digest][1] = keep[digest][1] or revoked
+                drop.append(id_)
+            else:
+                keep[digest] = [id_, revoked]
+        await conn.execute(
+            text(f"UPDATE {TABLE} SET revoked = :revoked WHERE id = :row_id"),
+            [{"row_id": id_, "revoked": bool(r)} for id_, r in keep.values()],
+        )
+        await conn.execute(
+            text(f"DELETE FROM {TABLE} WHERE id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": drop},
+        )
+    return len(drop)
+
+
+async def digest_index_valid(conn) -> bool | None:
+    """None — індексу немає; False — лишився INVALID після невдалої побудови."""
+    if conn.dialect.name != "postgresql":
+        # без CONCURRENTLY індекс або створено повністю, або немає зовсім
+        indexes = await conn.run_sync(lambda sync: inspect(sync).get_indexes(TABLE))
+        return True if any(i["name"] == DIGEST_INDEX for i in indexes) else None
+    return (
+        await conn.execute(
+            text(
+                "SELECT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+            ),
+            {"name": DIGEST_INDEX},
+        )
+    ).scalar()
+
+
+async def drop_invalid_index(engine: AsyncEngine) -> bool:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if await digest_index_valid(conn) is not False:
+            return False
+        log.warning(f"{DIGEST_INDEX} is INVALID after a failed build, rebuilding")
+        concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+        await conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {DIGEST_INDEX}"))
+    return True
+
+
+async def create_indexes(engine: AsyncEngine):
+    postgres = engine.dialect.name == "postgresql"
+    concurrently = "CONCURRENTLY " if postgres else ""
+    # CREATE INDEX CONCURRENTLY не може виконуватись у транзакції
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(
+            text(
+                f"CREATE UNIQUE INDEX {concurrently}IF NOT EXISTS {DIGEST_INDEX} "
+                f"ON {TABLE} (token_digest)"
+            )
+        )
+        # IF NOT EXISTS пропускає і INVALID індекс, напр. з паралельного запуску
+        if not await digest_index_valid(conn):
+            raise RuntimeError(
+                f"{DIGEST_INDEX} is not valid; rerun the migration to rebuild it"
+            )
+        await conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {OLD_INDEX}"))
+        if postgres:
+            await conn.execute(
+                text(f"ALTER TABLE {TABLE} ALTER COLUMN token_digest SET NOT NULL")
+            )
+
+
+async def migrate(engine: AsyncEngine, batch_size: int = 10_000) -> dict[str, int]:
+    added = await add_digest_column(engine)
+    await drop_invalid_index(engine)
+    filled = await backfill(engine, batch_size)
+    # безпосередньо перед побудовою: дублікат, що з'явився після злиття,
+    # зробив би унікальний індекс INVALID
+    merged = await merge_duplicates(engine)
+    await create_indexes(engine)
+    stats = {"column_added": int(added), "filled": filled, "merged": merged}
+    log.info(f"{TABLE} migrated: {stats}")
+    return stats
+
+
+async def main(batch_size: int):
+    from src.database import engine
+
+    await migrate(engine, batch_size)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Міграція refresh_tokens на token_digest"
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, text
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, LargeBinary, text
 from src.database import Base
+from src.auth.utils import token_digest
 from src.mixin_models import CreatedAtMixin
 from sqlalchemy import ForeignKey
 from src.database import get_base_class
@@ -10,10 +11,19 @@ from typing import List, TYPE_CHECKING
 if TYPE_CHECKING:
     from src.events.models import EventORM
 
+def _token_digest(context) -> bytes:
+    return token_digest(context.get_current_parameters()["token"])
+
+
 class RefreshTokenORM(Base, CreatedAtMixin):
     __tablename__ = "refresh_tokens"
-    token: Mapped[str]
-    user_id = Column(Integer, ForeignKey("users.id"))
+    token: Mapped[str] = mapped_column()
+    # пошук за токеном іде сюди; заповнюється з token, якщо не задано явно.
+    # Наявні бази: python -m src.auth.migrate_refresh_tokens
+    token_digest: Mapped[bytes] = mapped_column(
+        LargeBinary(32), unique=True, index=True, default=_token_digest
+    )
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     revoked: Mapped[bool] = mapped_column(Boolean, server_default=text("false"))
 
     user = relationship("UserORM", back_populates="tokens")
\ No newline at end of file
@@ -1,10 +1,84 @@
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from time import perf_counter
+
 import bcrypt
 
+from src.config import settings
+
 
-def hash_password(password: str) -> str:
-    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+def hash_password(password: str, rounds: int | None = None) -> str:
+    salt = bcrypt.gensalt(rounds or settings.auth_jwt.bcrypt_rounds)
+    hashed = bcrypt.hashpw(password.encode(), salt)
     return hashed.decode()  # <-- критично
 
 
 def verify_password(plain: str, hashed: str) -> bool:
+    # cost береться з самого хеша, тож старі хеші перевіряються як раніше
     return bcrypt.checkpw(plain.encode(), hashed.encode())
+
+
+@cache
+def password_executor() -> ThreadPoolExecutor:
+    """
+    Обмежений пул для bcrypt: хеш займає 100–300 мс CPU і не повинен
+    блокувати event loop. bcrypt відпускає GIL, тож потоків достатньо;
+    понад `password_workers` хеші чекають у черзі, а не перевантажують CPU.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.auth_jwt.password_workers, thread_name_prefix="bcrypt"
+    )
+
+
+async def hash_password_async(password: str, rounds: int | None = None) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor(), hash_password, password, rounds
+    )
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor(), verify_password, plain, hashed
+    )
+
+
+def measure(rounds: int, samples: int = 3) -> float:
+    """Середній час одного хеша з цим cost, мс."""
+    salt = bcrypt.gensalt(rounds)
+    start = perf_counter()
+    for _ in range(samples):
+        bcrypt.hashpw(b"calibration", salt)
+    return (perf_counter() - start) / samples * 1000
+
+
+def calibrate(
+    target_ms: float, min_rounds: int = 4, max_rounds: int = 16
+) -> tuple[int, dict[int, float]]:
+    """
+    Найбільший cost, за якого хеш на цій машині вкладається в target_ms,
+    і виміряний час (мс) для кожного перевіреного cost.
+    """
+    best = min_rounds
+    timings: dict[int, float] = {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        timings[rounds] = measure(rounds)
+        if timings[rounds] > target_ms:
+            break
+        best = rounds
+    return best, timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Підбір BCRYPT_ROUNDS під цільовий час хеша"
+    )
+    parser.add_argument("--target-ms", type=float, default=250)
+    args = parser.parse_args()
+    best, timings = calibrate(args.target_ms)
+    for rounds, elapsed in timings.items():
+        print(f"rounds={rounds}: {elapsed:.1f} ms")
+    print(f"BCRYPT_ROUNDS={best}")
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 from typing import Literal
-from pydantic import BaseModel, EmailStr, Field, FileUrl
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, FileUrl
 from src.users.schemas import User
 
 
@@ -33,9 +33,14 @@ class TokenCreate(BaseModel):
     username: str
     email: EmailStr
     is_admin: bool
+    # унікальний id refresh-токена: два логіни в одну секунду дають різні токени
+    jti: str | None = None
 
 
 class TokenInfo(TokenCreate):
+    # один екземпляр з кешу токенів віддається багатьом запитам
+    model_config = ConfigDict(frozen=True)
+
     iat: datetime
     exp: datetime
 
@@ -1,4 +1,5 @@
 from enum import verify
+from uuid import uuid4
 
 from jwt import InvalidTokenError
 
@@ -9,7 +10,9 @@ from src.auth.exceptions import (
     RegistrationError,
 )
 from src.auth.jwt_codec import JWTAuthCodec, get_jwt_codec
-from src.auth.password import hash_password, verify_password
+from src.auth.password import hash_password_async, verify_password_async
+from src.auth.token_cache import VerifiedTokenCache, verified_tokens
+from src.auth.utils import token_digest
 from src.auth.schemas import (
     ACCESS_TOKEN,
     REFRESH_TOKEN,
@@ -33,21 +36,25 @@ class AuthService:
         self,
         uow: IUnitOfWork,
         codec: JWTAuthCodec,
+        token_cache: VerifiedTokenCache = verified_tokens,
     ):
         self.uow = uow
         self.codec = codec
+        self.token_cache = token_cache
 
     async def login(self, user_login: UserLogin):
         async with self.uow as work:
             user = await work.users.find(email=eq(user_login.email))
-            if not user or not verify_password(user_login.password, user.password):
+            if not user or not await verify_password_async(
+                user_login.password, user.password
+            ):
                 raise LoginError("Uncorrect password")
             return await self.__genarate_tokens(user, work)
 
     async def register(self, user_data: UserRegister):
         async with self.uow as work:
             try:
-                hashed_password = hash_password(user_data.password)
+                hashed_password = await hash_password_async(user_data.password)
                 user_data.password = hashed_password
 
                 user = await work.users.add(user_data.model_dump())
@@ -57,13 +64,15 @@ class AuthService:
 
     async def refresh(self, refresh_token: str):
         async with self.uow as work:
-            token = await work.refresh_tokens.find(token=eq(refresh_token))
+            token = await work.refresh_tokens.find(
+                token_digest=eq(token_digest(refresh_token))
+            )
 
             if not token:
                 raise InvalidRefreshToken("token invalid ")
             if token.revoked:  # type: ignore
                 raise InvalidRefreshToken("Token revoked")
-            user = await work.users.find(id=eq(token.user_id))
+            user = await work.users.load(token.user_id)
             await work.commit()  # type: ignore
             if user.is_active:  # type: ignore
                 self.checking_invalid_token(refresh_token)
@@ -73,7 +82,9 @@ class AuthService:
     async def logout(self, refresh_token: str):
         self.checking_invalid_token(refresh_token)
         async with self.uow as work:
-            token = await work.refresh_tokens.find(token=eq(refresh_token))
+            token = await work.refresh_tokens.find(
+                token_digest=eq(token_digest(refresh_token))
+            )
             if token:
                 if not token.revoked:
                     token_model = await work.refresh_tokens.update(
@@ -84,11 +95,18 @@ class AuthService:
             raise InvalidRefreshToken()
 
     def auth(self, token: str):
+        # ротація ключів (on_reload) очищує кеш — перевіряємо її до кешу
+        self.codec.keys.refresh()
+        # той самий токен приходить з кожним запитом до кінця exp
+        token_info = self.token_cache.get(token)
+        if token_info is not None:
+            return token_info
         try:
 
             token_info = self.codec.decode(token)
             if token_info.type != ACCESS_TOKEN:
                 raise AuthenticationError("Is not access token")
+            self.token_cache.put(token, token_info)
             return token_info
         except InvalidTokenError:
             AuthenticationError("Invalid token")
@@ -121,6 +139,7 @@ class AuthService:
             username=user.nickname,
             email=user.email,
             is_admin=user.is_admin,
+            jti=uuid4().hex if type_ == REFRESH_TOKEN else None,
         )
         token = self.codec.encode(payload, expire_minutes=expire_minutes)
         return TokenSchemas(token=token)
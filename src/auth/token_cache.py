@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+from src.auth.schemas import TokenInfo
+from src.auth.utils import token_digest
+from src.config import settings
+
+
+class VerifiedTokenCache:
+    """
+    LRU-кеш перевірених access-токенів: sha256(токен) -> TokenInfo до `exp`.
+    Сам токен не зберігається. Кладуться лише токени, що пройшли перевірку
+    підпису, строку дії та типу, тож підроблений токен завжди має інший
+    ключ і йде на повну перевірку.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tokens: OrderedDict[bytes, tuple[float, TokenInfo]] = OrderedDict()
+        # sync-залежності FastAPI виконуються в пулі потоків
+        self._lock = Lock()
+
+    key = staticmethod(token_digest)
+
+    def get(self, token: str | bytes) -> TokenInfo | None:
+        key = self.key(token)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is not None:
+                expires, info = entry
+                # як і PyJWT: токен з exp == now уже недійсний
+                if expires > time.time():
+                    self._tokens.move_to_end(key)
+                    self.hits += 1
+                    return info
+                del self._tokens[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str | bytes, info: TokenInfo):
+        if self.maxsize <= 0:
+            return
+        expires = info.exp.timestamp()
+        key = self.key(token)
+        with self._lock:
+            self._tokens[key] = (expires, info)
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > self.maxsize:
+                self._tokens.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._tokens),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._tokens)
+
+
+# спільний для процесу: AuthService створюється на кожен запит
+verified_tokens = VerifiedTokenCache(settings.auth_jwt.token_cache_size)
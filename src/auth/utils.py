@@ -0,0 +1,8 @@
+import hashlib
+
+
+def token_digest(token: str | bytes) -> bytes:
+    """sha256 токена: 32 байти фіксованої довжини замість JWT у сотні символів."""
+    if isinstance(token, str):
+        token = token.encode()
+    return hashlib.sha256(token).digest()
@@ -10,13 +10,43 @@ load_dotenv()
 class DbSettings(BaseModel):
     url: str = os.getenv("DATABASE_URI")
     echo: bool = False
+    # репліки для read-only unit of work, через кому в DATABASE_REPLICA_URIS
+    replica_urls: list[str] = [
+        url for url in os.getenv("DATABASE_REPLICA_URIS", "").split(",") if url
+    ]
+    # пул з'єднань; розмір підбирається під кількість воркерів uvicorn
+    pool_size: int = int(os.getenv("DB_POOL_SIZE", 5))
+    max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # кеш prepared statements asyncpg на з'єднання (0 — вимкнути, для pgbouncer)
+    statement_cache_size: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    # діагностика повільних find/find_all: частка запитів, що заміряються
+    # (0 — вимкнено), поріг у мс та скільки останніх записів тримати
+    slow_query_sample_rate: float = float(os.getenv("DB_SLOW_QUERY_SAMPLE_RATE", 0))
+    slow_query_ms: float = float(os.getenv("DB_SLOW_QUERY_MS", 500))
+    slow_query_log_size: int = int(os.getenv("DB_SLOW_QUERY_LOG_SIZE", 100))
 
 
 class AuthJWT(BaseModel):
     private_key_path: Path = Path("src/certs/jwt-private.pem")
     public_key_path: Path = Path("src/certs/jwt-public.pem")
-    algorithm: str = "RS256"
+    # RS256, ES256 або EdDSA — має відповідати типу ключа, див. init_jwt_key.sh
+    algorithm: str = os.getenv("JWT_ALGORITHM", "RS256")
+    # попередні публічні ключі, якими ще перевіряються токени під час ротації
+    verify_key_paths: list[Path] = [
+        Path(p) for p in os.getenv("JWT_VERIFY_KEYS", "").split(",") if p.strip()
+    ]
     access_token_expire_minutes: int = 15
+    # як часто перевіряти mtime файлів ключів, с (0 — лише за SIGHUP)
+    key_reload_seconds: float = float(os.getenv("JWT_KEY_RELOAD_SECONDS", 5))
+    # cost bcrypt для нових хешів паролів, див. python -m src.auth.password
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    # потоки для bcrypt на воркер uvicorn
+    password_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    # скільки перевірених access-токенів тримати в пам'яті (0 — без кешу)
+    token_cache_size: int = int(os.getenv("JWT_TOKEN_CACHE_SIZE", 10_000))
 
 
 class Settings(BaseSettings):
@@ -0,0 +1,31 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from src.exceptions import InvalidQueryError
+
+
+def _default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Value {value!r} can`t be used in cursor")
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Пакує значення ключа сортування останнього рядка у непрозорий токен."""
+    raw = json.dumps(values, default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> list[Any]:
+    """Розпаковує токен, створений `encode_cursor`."""
+    try:
+        padding = "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(token + padding))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as e:
+        raise InvalidQueryError(f"Invalid cursor '{token}'") from e
+    if not isinstance(values, list):
+        raise InvalidQueryError(f"Invalid cursor '{token}'")
+    return values
@@ -1,4 +1,5 @@
-from typing import Annotated
+from itertools import cycle
+from typing import Annotated, Any
 from sqlalchemy import Column, Integer
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -7,14 +8,54 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from fastapi import Depends
-from src.config import settings
+from src.config import DbSettings, settings
+from src.pool_metrics import InstrumentedAsyncPool
 
 
+def engine_kwargs(url: str, db: DbSettings = settings.db) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {"echo": db.echo}
+    if url.startswith("sqlite"):
+        # у SQLite свій пул (StaticPool для :memory:), налаштування пулу не застосовні
+        return kwargs
+    kwargs.update(
+        poolclass=InstrumentedAsyncPool,
+        pool_size=db.pool_size,
+        max_overflow=db.max_overflow,
+        pool_timeout=db.pool_timeout,
+        pool_recycle=db.pool_recycle,
+        pool_pre_ping=db.pool_pre_ping,
+    )
+    if "+asyncpg" in url:
+        kwargs["connect_args"] = {"statement_cache_size": db.statement_cache_size}
+    return kwargs
 
-engine = create_async_engine(**settings.db.model_dump())
+
+engine = create_async_engine(settings.db.url, **engine_kwargs(settings.db.url))
 new_async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
+class RoundRobinSessionFactory:
+    """Фабрика сесій, що по черзі роздає сесії з кількох sessionmaker-ів."""
+
+    def __init__(self, factories: list[async_sessionmaker]):
+        self.factories = factories
+        self._next = cycle(factories)
+
+    def __call__(self) -> AsyncSession:
+        return next(self._next)()
+
+
+replica_engines = [
+    create_async_engine(url, **engine_kwargs(url))
+    for url in settings.db.replica_urls
+]
+# без реплік read-only запити йдуть в основну базу
+new_replica_session = RoundRobinSessionFactory(
+    [async_sessionmaker(e, expire_on_commit=False) for e in replica_engines]
+    or [new_async_session]
+)
+
+
 async def get_session():
     async with new_async_session() as session:
         yield session
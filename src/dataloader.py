@@ -0,0 +1,93 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+Batch = Callable[[list[K]], Awaitable[dict[K, V]]]
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Збирає виклики `load(key)` одного проходу event loop в один виклик
+    `batch(keys)` і запам'ятовує результати до `clear()`.
+
+        loader = DataLoader(repo.find_by_ids)
+        a, b = await asyncio.gather(loader.load(1), loader.load(2))  # один запит
+        await loader.load(1)  # без запиту
+    """
+
+    def __init__(self, batch: Batch):
+        self._batch = batch
+        self._cache: dict[K, asyncio.Future] = {}
+        self._pending: dict[K, asyncio.Future] = {}
+        self._scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+        # сесія не допускає паралельних запитів, тому пачки йдуть по черзі
+        self._lock = asyncio.Lock()
+        self.batches = 0
+
+    def load(self, key: K) -> Awaitable[V | None]:
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            future.add_done_callback(lambda f: self._forget(key, f))
+            self._pending[key] = future
+            if not self._scheduled:
+                # call_soon: спершу дочекаємось решти load() з цього ж проходу
+                self._scheduled = True
+                loop.call_soon(self._schedule)
+        # скасування одного з тих, хто чекає (напр. клієнт відключився),
+        # не скасовує спільний результат для решти
+        return asyncio.shield(future)
+
+    def prime(self, key: K, value: V):
+        """Кладе відомий результат у кеш, напр. щойно доданий рядок."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._cache[key] = future
+
+    def clear(self):
+        """Скидає запам'ятовані результати; очікувані запити завершаться як є."""
+        self._cache = {
+            key: future for key, future in self._cache.items() if not future.done()
+        }
+
+    def _forget(self, key: K, future: asyncio.Future):
+        # скасоване чи невдале не запам'ятовуємо — наступний load спробує знову
+        failed = future.cancelled() or future.exception() is not None
+        if failed and self._cache.get(key) is future:
+            del self._cache[key]
+
+    def _schedule(self):
+        task = asyncio.ensure_future(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self):
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+            if not pending:
+                return
+            self.batches += 1
+            try:
+                found = await self._batch(list(pending))
+            except BaseException as e:
+                for key, future in pending.items():
+                    # помилку не запам'ятовуємо — наступний load спробує знову
+                    if self._cache.get(key) is future:
+                        del self._cache[key]
+                    if future.done():
+                        continue
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+                if not isinstance(e, Exception):
+                    raise
+                return
+            for key, future in pending.items():
+                if not future.done():
+                    future.set_result(found.get(key))
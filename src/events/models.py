@@ -2,6 +2,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import ForeignKey
 from src.database import get_base_class
 from src.mixin_models import CreatedAtMixin
+from src.search import searchable
 from datetime import datetime
 
 Base = get_base_class()
@@ -13,11 +14,13 @@ if TYPE_CHECKING:
 
 class EventORM(Base, CreatedAtMixin):
     __tablename__ = "events"
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
     title: Mapped[str]
     description: Mapped[str | None]
     location: Mapped[str]
-    start_time: Mapped[datetime]
+    start_time: Mapped[datetime] = mapped_column(index=True)
     end_time: Mapped[datetime]
 
     owner: Mapped["UserORM"] = relationship(back_populates="events")
@@ -27,4 +30,8 @@ class EventORM(Base, CreatedAtMixin):
         cascade="all, delete-orphan",
     )
     seats: Mapped[list["SeatsORM"]] = relationship(
-        back_populates="event")
\ No newline at end of file
+        back_populates="event")
+
+
+# повнотекстовий пошук: EventORM.document та індекси, див. src/search.py
+searchable(EventORM, "title", "description")
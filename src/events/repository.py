@@ -5,4 +5,5 @@ from src.events.models import EventORM
 
 class EventRepository(RepositoryORM[EventORM]):
     model = EventORM
-    pass
\ No newline at end of file
+    cursor_fields = ("start_time", "id")
+    orderable = ("start_time", "end_time", "title", "location")
\ No newline at end of file
@@ -1,11 +1,14 @@
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from src.auth.dependencies import AuthAdmin
 from src.events.dependencies import EventServiceDep
 from src.events.exceptions import EventNotFoundError, EventPermissionError
 from src.events.schemas import EventCreate, EventResponse, EventUpdate
+from src.filter import Filter
 from src.mixin_schemas import Collection, Pagination
+from src.query_filter import QueryFilter, QueryOrder
 
 router = APIRouter(
     prefix="/events",
@@ -13,6 +16,27 @@ router = APIRouter(
 )
 
 
+class EventFilter(Filter):
+    title: str
+    location: str
+    start_time: datetime
+    end_time: datetime
+
+
+# ?start_time__gte=...&location__in=Kyiv,Lviv&title__contains=jazz
+EventQuery = QueryFilter(
+    EventFilter,
+    reserved=("q",),
+    title=("eq", "contains", "starts_with"),
+    location=("eq", "in"),
+    start_time=("gte", "lte", "between"),
+    end_time=("gte", "lte", "between"),
+)
+
+# ?order_by=-start_time — лише поля з індексом
+EventOrder = QueryOrder("start_time")
+
+
 @router.post(
     "",
     response_model=EventResponse,
@@ -31,6 +55,21 @@ async def create_event(
     return new_event
 
 
+@router.get(
+    "/search",
+    response_model=Collection[EventResponse],
+    summary="Повнотекстовий пошук подій за назвою та описом",
+)
+async def search_events(
+    service: EventServiceDep,
+    q: str = Query(min_length=1, max_length=200, description="Пошуковий запит"),
+    pagin=Depends(Pagination),
+    filter=Depends(EventQuery),
+):
+    """Найрелевантніші події першими; наступна сторінка — через `after`."""
+    return await service.search_events(q, pagin, filter)
+
+
 @router.get(
     "/{event_id}",
     response_model=EventResponse,
@@ -56,10 +95,13 @@ async def get_event(
     summary="Отримати список усіх подій",
 )
 async def get_all_events(
-    service: EventServiceDep,pagin=Depends(Pagination)
+    service: EventServiceDep,
+    pagin=Depends(Pagination),
+    filter=Depends(EventQuery),
+    order_by=Depends(EventOrder),
 ):
     """Повертає список усіх подій, доступних у системі."""
-    return await service.get_all_events(pagin)
+    return await service.get_all_events(pagin, filter, order_by)
 
 
 @router.patch(
@@ -1,7 +1,7 @@
 
 from src.events.exceptions import EventNotFoundError, EventPermissionError
 from src.events.schemas import EventCreate, EventResponse, EventUpdate
-from src.filter import eq
+from src.filter import Filter, FilterExpr
 from src.interface import IUnitOfWork
 from src.mixin_schemas import Collection, Pagination
 from src.tickets.schemas import TicketCreate
@@ -51,28 +51,76 @@ class EventService:
 
     async def get_event(self, event_id: int) -> EventResponse:
         
-        async with self.uow as work:
-            event_orm = await work.events.find(id=eq(event_id))
+        async with self.uow.read_only() as work:
+            event_orm = await work.events.load(event_id)
 
             if not event_orm:
                 raise EventNotFoundError(f"Подію з ID {event_id} не знайдено.")
 
             return EventResponse.model_validate(event_orm)
 
-    async def get_all_events(self,pagin:Pagination) -> Collection[EventResponse]:
+    async def search_events(
+        self,
+        query: str,
+        pagin: Pagination,
+        filter: Filter | FilterExpr | None = None,
+    ) -> Collection[EventResponse]:
+        """Повнотекстовий пошук; offset не підтримується — лише курсор."""
+        async with self.uow.read_only() as work:
+            events_orm = await work.events.search(
+                query,
+                limit=pagin.limit,
+                after=pagin.after,
+                filter=filter,
+                columns=EventResponse,
+            )
+
+            events_models = [EventResponse.model_validate(e) for e in events_orm]
+            return Collection(
+                limit=pagin.limit,
+                after=pagin.after,
+                collection=events_models,
+                size=len(events_models),
+                next_cursor=events_orm.next_cursor,
+            )
+
+    async def get_all_events(
+        self,
+        pagin: Pagination,
+        filter: Filter | FilterExpr | None = None,
+        order_by: tuple[str, ...] | None = None,
+    ) -> Collection[EventResponse]:
         
-        async with self.uow as work:
-            events_orm = await work.events.find_all(offset=pagin.offset,limit=pagin.limit)
+        async with self.uow.read_only() as work:
+            events_orm = await work.events.find_all(
+                filter=filter,
+                order_by=order_by,
+                require_index=True,
+                offset=pagin.offset,
+                limit=pagin.limit,
+                after=pagin.after,
+                total=pagin.count,
+                columns=EventResponse,
+            )
 
             events_models = [EventResponse.model_validate(e) for e in events_orm]
-            return Collection(offset =pagin.offset,limit=pagin.limit,collection=events_models,size=len(events_models))
+            return Collection(
+                offset=pagin.offset,
+                limit=pagin.limit,
+                after=pagin.after,
+                collection=events_models,
+                size=len(events_models),
+                next_cursor=events_orm.next_cursor,
+                count=pagin.count,
+                total=events_orm.total,
+            )
 
     async def update_event(
         self, event_id: int, update_data: EventUpdate, current_user_id: int
     ) -> EventResponse:
         
         async with self.uow as work:
-            event_orm = await work.events.find(id=eq(event_id))
+            event_orm = await work.events.load(event_id)
 
             if not event_orm:
                 raise EventNotFoundError(f"Подію з ID {event_id} не знайдено.")
@@ -102,7 +150,7 @@ class EventService:
     async def delete_event(self, event_id: int, current_user_id: int) -> bool:
         
         async with self.uow as work:
-            event_orm = await work.events.find(id=eq(event_id))
+            event_orm = await work.events.load(event_id)
 
             if not event_orm:
                 raise EventNotFoundError(f"Подію з ID {event_id} не знайдено.")
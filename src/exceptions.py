@@ -12,3 +12,7 @@ class IntegrityRepositoryError(RepositoryError):
 
 class InvalidQueryError(RepositoryError):
     """Некоректні параметри фільтрації або запиту."""
+
+
+class ReadOnlyError(RepositoryError):
+    """Спроба запису через read-only unit of work."""
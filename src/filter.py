@@ -1,17 +1,53 @@
 import logging
-from typing import Any, Callable, TypeVar, Union, get_type_hints, Sized, Tuple
-from sqlalchemy import Column, func
+import operator as _operator
+import re
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    NamedTuple,
+    TypeVar,
+    Union,
+    get_type_hints,
+    Sized,
+    Tuple,
+)
+from sqlalchemy import Column, and_, bindparam, func, not_, or_, true
 from datetime import datetime
 
 from src.database import Base
+from src.search import match, search_terms
 
 log = logging.getLogger(__name__)
 C = TypeVar("C")
 V = TypeVar("V")
 
 
+_UNSET = object()
+
+
+def column_python_type(col: Column) -> type | None:
+    """Python тип колонки або None, якщо тип його не визначає."""
+    try:
+        return col.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
 class Op:
-    def __init__(self, value: Any, operator: Callable[[C, V], bool], _types: Any = Any):
+    def __init__(
+        self,
+        value: Any,
+        operator: Callable[[C, V], bool],
+        _types: Any = Any,
+        bindable: bool = False,
+        expanding: bool = False,
+        prepare: Callable[[Any], Any] | None = None,
+        arity: int = 1,
+        typed: bool = True,
+        evaluator: Callable[[Any, Any], bool | None] | None = None,
+    ):
         if _types != Any:
             if not isinstance(value, _types):
                 raise TypeError()
@@ -19,21 +55,92 @@ class Op:
         self.value = value
 
         self.operator = operator
+        # bindable: оператор можна застосувати до bindparam замість значення,
+        # тобто форма SQL не залежить від value і її можна кешувати
+        self.bindable = bindable
+        self.expanding = expanding
+        # prepare: перетворення значення перед передачею в SQL (напр. шаблон LIKE)
+        self.prepare = prepare
+        # arity: скільки bind-параметрів приймає оператор (between — 2)
+        self.arity = arity
+        # typed: значення має тип колонки (для len_* це int, а не тип колонки)
+        self.typed = typed
+        # evaluator: та сама умова в Python, (значення поля, операнд) -> True/False/None
+        self.evaluator = evaluator
+
+    def apply(self, col: Column, python_type: Any = _UNSET):
+        return self._call(col, self.params_value(col, python_type))
+
+    def with_value(self, value: Any) -> "Op":
+        """Новий Op з тим самим оператором — шаблон фільтра не змінюється."""
+        op = object.__new__(Op)
+        op.__dict__.update(self.__dict__)
+        op.value = value
+        return op
 
-    def apply(self, col: Column):
-        # Отримуємо Python тип з SQLAlchemy колонки
-        python_type = col.type.python_type
+    def bind(self, col: Column, key: str):
+        """Умова з іменованими bind-параметрами; значення дає `params`."""
+        type_ = col.type if self.typed else None
+        if self.arity > 1:
+            value = tuple(
+                bindparam(f"{key}_{i}", type_=type_) for i in range(self.arity)
+            )
+        else:
+            value = bindparam(key, type_=type_, expanding=self.expanding)
+        return self._call(col, value)
+
+    def params(self, col: Column, key: str, python_type: Any = _UNSET) -> dict:
+        """Значення bind-параметрів для умови, побудованої `bind`."""
+        value = self.params_value(col, python_type)
+        if self.arity > 1:
+            return {f"{key}_{i}": v for i, v in enumerate(value)}
+        return {key: value}
+
+    def params_value(self, col: Column, python_type: Any = _UNSET):
+        value = self.check(col, python_type)
+        if self.prepare is not None and value is not None:
+            value = self.prepare(value)
+        return value
+
+    def check(self, col: Column, python_type: Any = _UNSET):
+        if not self.typed:
+            return self.value
+        # Python тип колонки; FilterHeadler передає вже обчислений
+        if python_type is _UNSET:
+            python_type = column_python_type(col)
         value_type = type(self.value)
 
         # Перевірка типів (пропускаємо для None та list для IN оператора)
-        if self.value is not None and not isinstance(self.value, (list, tuple)):
+        if (
+            python_type is not None
+            and self.value is not None
+            and not isinstance(self.value, (list, tuple))
+        ):
             if value_type != python_type:
                 raise TypeError(
                     f"Column '{col.name}' is {python_type.__name__}, not {value_type.__name__}"
                 )
+        return self.value
 
+    def predicate(self) -> Callable[[Any], bool | None]:
+        """
+        Умова для обчислення в пам'яті з семантикою SQL: None означає
+        unknown (NULL), тобто рядок не проходить WHERE.
+        """
+        if self.evaluator is None:
+            raise TypeError(f"{self!r} can`t be evaluated in memory")
+        operand = self.value
+        if self.prepare is not None and operand is not None:
+            operand = self.prepare(operand)
+        evaluator = self.evaluator
+        return lambda value: evaluator(value, operand)
+
+    def evaluate(self, value: Any) -> bool | None:
+        return self.predicate()(value)
+
+    def _call(self, col: Column, value: Any):
         try:
-            result = self.operator(col, self.value)
+            result = self.operator(col, value)
         except AttributeError as e:
             raise TypeError(
                 f"Column '{col}' does not support this operator "
@@ -49,96 +156,419 @@ class Op:
         return f"Op({op_name}, {self.value!r})"
 
 
-def op_factory(operator, annotations=Any):
+def op_factory(
+    operator,
+    annotations=Any,
+    bindable=True,
+    expanding=False,
+    prepare=None,
+    arity=1,
+    typed=True,
+    evaluator=None,
+):
     def wrapper(value=None):
-        return Op(value=value, operator=operator)
+        return Op(
+            value=value,
+            operator=operator,
+            bindable=bindable,
+            expanding=expanding,
+            prepare=prepare,
+            arity=arity,
+            typed=typed,
+            evaluator=evaluator,
+        )
 
     return wrapper
 
 
+# ==================== Обчислення в пам'яті (семантика SQL) ====================
+
+
+def and3(a: bool | None, b: bool | None) -> bool | None:
+    """AND у трьохзначній логіці SQL: None — unknown."""
+    if a is False or b is False:
+        return False
+    if a is None or b is None:
+        return None
+    return True
+
+
+def or3(a: bool | None, b: bool | None) -> bool | None:
+    if a is True or b is True:
+        return True
+    if a is None or b is None:
+        return None
+    return False
+
+
+def not3(a: bool | None) -> bool | None:
+    return None if a is None else not a
+
+
+@lru_cache(maxsize=256)
+def like_pattern(pattern: str) -> re.Pattern:
+    """LIKE як regex: % — будь-який рядок, _ — один символ, з урахуванням регістру."""
+    parts = []
+    for char in pattern:
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.DOTALL)
+
+
+def _null_safe(compare: Callable[[Any, Any], bool]):
+    # NULL у будь-якому операнді дає unknown, як `col > NULL` у SQL
+    def evaluate(value, operand):
+        if value is None or operand is None:
+            return None
+        return compare(value, operand)
+
+    return evaluate
+
+
+_gt = _null_safe(_operator.gt)
+_lt = _null_safe(_operator.lt)
+_gte = _null_safe(_operator.ge)
+_lte = _null_safe(_operator.le)
+
+
+def _eq(value, operand):
+    # col == None компілюється в IS NULL
+    if operand is None:
+        return value is None
+    return None if value is None else value == operand
+
+
+def _neq(value, operand):
+    if operand is None:
+        return value is not None
+    return None if value is None else value != operand
+
+
+def _in(value, operand):
+    if not operand:
+        return False
+    if value is None:
+        return None
+    if value in operand:
+        return True
+    # x IN (1, NULL) без збігу — unknown
+    return None if None in operand else False
+
+
+def _between(value, operand):
+    low, high = operand
+    return and3(_gte(value, low), _lte(value, high))
+
+
+_like = _null_safe(lambda value, pattern: like_pattern(pattern).fullmatch(value) is not None)
+
+
 TYPE_BEING_COMPARED = Union[float, int, datetime, str]
 MASIVE = Union[set, list, tuple]
 
-eq = op_factory(lambda col, val: col == val, Any)
-neq = op_factory(lambda col, val: col != val, Any)
-gt = op_factory(lambda col, val: col > val, TYPE_BEING_COMPARED)
-lt = op_factory(lambda col, val: col < val, TYPE_BEING_COMPARED)
-gte = op_factory(lambda col, val: col >= val, TYPE_BEING_COMPARED)
-lte = op_factory(lambda col, val: col <= val, TYPE_BEING_COMPARED)
-like = op_factory(lambda col, val: col.like(val), str)  # LIKE (пошук за зразком)
-in_ = op_factory(lambda col, val: col.in_(val), MASIVE)  # IN (входить у список)
-# не протестовані
+eq = op_factory(lambda col, val: col == val, Any, evaluator=_eq)
+neq = op_factory(lambda col, val: col != val, Any, evaluator=_neq)
+gt = op_factory(lambda col, val: col > val, TYPE_BEING_COMPARED, evaluator=_gt)
+lt = op_factory(lambda col, val: col < val, TYPE_BEING_COMPARED, evaluator=_lt)
+gte = op_factory(lambda col, val: col >= val, TYPE_BEING_COMPARED, evaluator=_gte)
+lte = op_factory(lambda col, val: col <= val, TYPE_BEING_COMPARED, evaluator=_lte)
+like = op_factory(
+    lambda col, val: col.like(val), str, evaluator=_like
+)  # LIKE (пошук за зразком)
+in_ = op_factory(
+    lambda col, val: col.in_(val), MASIVE, expanding=True, evaluator=_in
+)  # IN (входить у список)
 between = op_factory(
     lambda col, val: col.between(val[0], val[1]),
     Tuple[TYPE_BEING_COMPARED, TYPE_BEING_COMPARED],
+    arity=2,
+    evaluator=_between,
+)
+# шаблон будується зі значення, а не в SQL — форма запиту не залежить від value
+starts_with = op_factory(
+    lambda col, val: col.like(val), str, prepare=lambda val: f"{val}%", evaluator=_like
+)
+ends_with = op_factory(
+    lambda col, val: col.like(val), str, prepare=lambda val: f"%{val}", evaluator=_like
+)
+contains = op_factory(
+    lambda col, val: col.like(val), str, prepare=lambda val: f"%{val}%", evaluator=_like
+)
+not_like = op_factory(
+    lambda col, val: ~col.like(val), str, evaluator=lambda v, p: not3(_like(v, p))
+)
+
+
+def _length(compare):
+    return _null_safe(lambda value, size: compare(len(value), size))
+
+
+len_gt = op_factory(
+    lambda col, val: func.length(col) > val,
+    Sized,
+    typed=False,
+    evaluator=_length(_operator.gt),
+)
+len_lt = op_factory(
+    lambda col, val: func.length(col) < val,
+    Sized,
+    typed=False,
+    evaluator=_length(_operator.lt),
+)
+len_gte = op_factory(
+    lambda col, val: func.length(col) >= val,
+    Sized,
+    typed=False,
+    evaluator=_length(_operator.ge),
+)
+len_lte = op_factory(
+    lambda col, val: func.length(col) <= val,
+    Sized,
+    typed=False,
+    evaluator=_length(_operator.le),
+)
+len_eq = op_factory(
+    lambda col, val: func.length(col) == val,
+    Sized,
+    typed=False,
+    evaluator=_length(_operator.eq),
+)
+# повнотекстовий пошук по `document` моделі (див. src/search.py)
+search = op_factory(
+    lambda col, val: match(col, val), str, prepare=search_terms
 )
-starts_with = op_factory(lambda col, val: col.like(f"{val}%"), str)
-ends_with = op_factory(lambda col, val: col.like(f"%{val}"), str)
-contains = op_factory(lambda col, val: col.like(f"%{val}%"), str)
-not_like = op_factory(lambda col, val: ~col.like(val), str)
-len_gt = op_factory(lambda col, val: func.length(col) > val, Sized)
-len_lt = op_factory(lambda col, val: func.length(col) < val, Sized)
-len_gte = op_factory(lambda col, val: func.length(col) >= val, Sized)
-len_lte = op_factory(lambda col, val: func.length(col) <= val, Sized)
-len_eq = op_factory(lambda col, val: func.length(col) == val, Sized)
-
-
-class Filter:
+
+# імена операторів для зовнішніх запитів (`?field__op=value`)
+OPERATORS: dict[str, Callable[[Any], Op]] = {
+    "eq": eq,
+    "neq": neq,
+    "gt": gt,
+    "lt": lt,
+    "gte": gte,
+    "lte": lte,
+    "like": like,
+    "not_like": not_like,
+    "in": in_,
+    "between": between,
+    "starts_with": starts_with,
+    "ends_with": ends_with,
+    "contains": contains,
+    "len_gt": len_gt,
+    "len_lt": len_lt,
+    "len_gte": len_gte,
+    "len_lte": len_lte,
+    "len_eq": len_eq,
+    "search": search,
+}
+
+
+class _FieldSpec(NamedTuple):
+    type_: Any
+    # Op-шаблон: оператор поля без значення
+    template: Any
+    # тип для isinstance в overload або None, якщо анотацію так не перевірити
+    check: Any
+
+
+def _isinstance_type(type_: Any) -> Any:
+    try:
+        isinstance(None, type_)
+    except TypeError:
+        return None
+    return type_
+
+
+class FilterMeta(type):
+    """Компілює специфікацію полів фільтра один раз — при створенні класу."""
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        # поля живуть у _ops, тому екземплярам не потрібен __dict__
+        namespace.setdefault("__slots__", ())
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        cls._fields = mcs._compile(cls)
+        return cls
+
+    @staticmethod
+    def _compile(cls) -> dict[str, _FieldSpec]:
+        inherited: dict[str, _FieldSpec] = {}
+        for base in reversed(cls.__mro__[1:]):
+            inherited.update(getattr(base, "_fields", {}))
+        fields = {}
+        for field, type_ in get_type_hints(cls).items():
+            if field.startswith("_"):
+                continue
+            if field in cls.__dict__:
+                # оператор за замовчуванням переїжджає зі класу в специфікацію,
+                # щоб екземпляри не ділили один і той самий Op
+                template = cls.__dict__[field]
+                delattr(cls, field)
+            elif field in inherited:
+                fields[field] = inherited[field]
+                continue
+            else:
+                template = None
+            fields[field] = _FieldSpec(
+                type_, template or eq(), _isinstance_type(type_)
+            )
+        return fields
+
+
+class Filter(metaclass=FilterMeta):
+    __slots__ = ("_ops",)
+    _fields: ClassVar[dict[str, _FieldSpec]]
+
     def __init__(self, **kwargs):
-        self.__dict = {}
-        self.__init_attrs(**kwargs)
-
-    def __init_attrs(self, **kwargs):
-        annotations = get_type_hints(self.__class__)
-        for field, type_ in annotations.items():
-
-            value = kwargs.get(field)
-            self.__add_value(field, value)
-
-    def __add_attr(self, field: str, value: Op):
-        self.__dict[field] = value
-        setattr(self, field, value)
-
-    def __add_value(self, field: str, value: Any):
-        operator = getattr(self.__class__, field, None) or eq()
-        # якщо оператор — це функція з _operator_symbol, то викликаємо її
-        if isinstance(operator, Op):
-            operator.value = value
-            self.__add_attr(field, operator)
-        else:
-            raise ValueError(f"Invalid operater {operator}")
+        ops = {}
+        for field, spec in self._fields.items():
+            if not isinstance(spec.template, Op):
+                raise ValueError(f"Invalid operater {spec.template}")
+            if field in kwargs:
+                ops[field] = spec.template.with_value(kwargs[field])
+        self._ops = ops
+
+    def __getattr__(self, name: str):
+        try:
+            ops = object.__getattribute__(self, "_ops")
+        except AttributeError:
+            raise AttributeError(name) from None
+        if name in ops:
+            return ops[name]
+        if name in self._fields:
+            return None
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
 
     def overload(self, **kwargs: Op):
-        annotations = get_type_hints(self.__class__)
         for field, op in kwargs.items():
-            type_ = annotations.get(field)
-            if type_:
-                if not isinstance(op.value, type_):
+            spec = self._fields.get(field)
+            if spec is not None and spec.check is not None and op.typed:
+                # in_/between перевіряються поелементно
+                values = (
+                    op.value
+                    if (op.expanding or op.arity > 1)
+                    and isinstance(op.value, (list, tuple, set))
+                    else (op.value,)
+                )
+                if not all(isinstance(v, spec.check) for v in values):
                     raise ValueError(
-                        f"Field '{field}' must by '{type_}', not '{type(op)}'"
+                        f"Field '{field}' must by '{spec.type_}', not '{type(op)}'"
                     )
-            self.__add_attr(field, op)
+            self._ops[field] = op
+        return self
+
+    def __and__(self, other: "Filter | FilterExpr") -> "FilterExpr":
+        return FilterExpr.of("and", self, other)
+
+    def __or__(self, other: "Filter | FilterExpr") -> "FilterExpr":
+        return FilterExpr.of("or", self, other)
+
+    def __invert__(self) -> "FilterExpr":
+        return FilterExpr("not", self)
+
+    def copy(self) -> "Filter":
+        new = object.__new__(self.__class__)
+        new._ops = dict(self._ops)
+        return new
 
     def __repr__(self):
-        fields = ", ".join(f"{k}={v}" for k, v in self.__dict__.items())
+        fields = ", ".join(f"{k}={v}" for k, v in self._ops.items())
         return f"{self.__class__.__name__}({fields})"
 
     def to_dict(self) -> dict[str, Op]:
-        return self.__dict
+        return self._ops
+
+
+class FilterExpr:
+    """Логічний вираз над фільтрами: `a & b`, `a | b`, `~a`."""
+
+    __slots__ = ("op", "children")
+
+    def __init__(self, op: str, *children: "Filter | FilterExpr"):
+        for child in children:
+            if not isinstance(child, (Filter, FilterExpr)):
+                raise TypeError(
+                    f"Filter expression accepts Filter, not {type(child)}"
+                )
+        self.op = op
+        self.children = children
+
+    @classmethod
+    def of(cls, op: str, left, right) -> "FilterExpr":
+        # (a | b) | c -> or(a, b, c): менше вкладеності, той самий SQL
+        children = []
+        for child in (left, right):
+            if isinstance(child, FilterExpr) and child.op == op:
+                children.extend(child.children)
+            else:
+                children.append(child)
+        return cls(op, *children)
+
+    def __and__(self, other: "Filter | FilterExpr") -> "FilterExpr":
+        return FilterExpr.of("and", self, other)
+
+    def __or__(self, other: "Filter | FilterExpr") -> "FilterExpr":
+        return FilterExpr.of("or", self, other)
+
+    def __invert__(self) -> "FilterExpr":
+        return FilterExpr("not", self)
+
+    def __repr__(self):
+        if self.op == "not":
+            return f"~{self.children[0]!r}"
+        sep = " & " if self.op == "and" else " | "
+        return "(" + sep.join(repr(child) for child in self.children) + ")"
+
+
+def equality_fields(expr: "Filter | FilterExpr") -> set[str]:
+    """
+    Поля, зафіксовані `eq` на верхньому рівні AND: для кожного рядка
+    результату вони однакові, тож на порядок сортування не впливають.
+    """
+    if isinstance(expr, Filter):
+        return {name for name, op in expr.to_dict().items() if op.evaluator is _eq}
+    if expr.op != "and":
+        return set()
+    return set().union(*(equality_fields(child) for child in expr.children))
+
+
+_JOINS = {"and": and_, "or": or_}
 
 
 class FilterHeadler:
     def __init__(self, model: Base):
         self.model = model
+        # Python типи колонок рахуються один раз на поле, а не на кожен запит
+        self._types: dict[str, type | None] = {}
 
     def __call__(self, values):
         return self.to_conditions(values)
 
-    def to_conditions(self, _filter: Filter) -> list[Callable]:
-        conditions = []
+    def to_conditions(self, _filter: "Filter | FilterExpr") -> list[Callable]:
+        if isinstance(_filter, FilterExpr):
+            return self.plan_conditions(*self.plan(_filter), bound=False)
+        return [
+            op.apply(column, self.python_type(name, column))
+            for name, column, op in self.resolve(_filter)
+        ]
+
+    def python_type(self, field_name: str, column: Column) -> type | None:
+        try:
+            return self._types[field_name]
+        except KeyError:
+            type_ = self._types[field_name] = column_python_type(column)
+            return type_
+
+    def resolve(self, _filter: Filter) -> list[tuple[str, Column, Op]]:
+        """Поля фільтра разом з колонками моделі; невідомі поля відкидаються."""
+        items = []
         for field_name, op in _filter.to_dict().items():
             column: Column = getattr(self.model, field_name, None)
-            if not column:
+            if column is None:
                 log.error(
                     f"Filter isn`t correct '%s',The field '%s' does not contain '%s'.",
                     _filter.__class__.__name__,
@@ -146,7 +576,96 @@ class FilterHeadler:
                     self.model.__class__.__name__,
                 )
                 continue
-            cunc_func, v = op.operator, op.value
+            items.append((field_name, column, op))
+        return items
+
+    @staticmethod
+    def shape(items: list[tuple[str, Column, Op]]) -> tuple | None:
+        """Ключ форми запиту або None, якщо умову не можна зв'язати параметрами."""
+        key = []
+        for field_name, _, op in items:
+            if not op.bindable:
+                return None
+            key.append((field_name, op.operator, op.value is None))
+        return tuple(key)
+
+    def to_bound_conditions(
+        self, items: list[tuple[str, Column, Op]], prefix: str = "f_"
+    ) -> list:
+        # None лишається в SQL (IS NULL), інші значення стають параметрами
+        return [
+            op.apply(column, self.python_type(name, column))
+            if op.value is None
+            else op.bind(column, f"{prefix}{name}")
+            for name, column, op in items
+        ]
+
+    def to_params(
+        self, items: list[tuple[str, Column, Op]], prefix: str = "f_"
+    ) -> dict[str, Any]:
+        params = {}
+        for name, column, op in items:
+            if op.value is not None:
+                params.update(
+                    op.params(column, f"{prefix}{name}", self.python_type(name, column))
+                )
+        return params
+
+    def plan(self, expr: "Filter | FilterExpr") -> tuple[Any, list[list[tuple]]]:
+        """
+        Розкладає вираз на дерево та листи: лист — індекс у списку
+        розв'язаних фільтрів, вузол — (op, дочірні вузли).
+        """
+        leaves: list[list[tuple]] = []
+
+        def walk(node):
+            if isinstance(node, Filter):
+                leaves.append(self.resolve(node))
+                return len(leaves) - 1
+            return (node.op, tuple(walk(child) for child in node.children))
+
+        return walk(expr), leaves
+
+    def plan_shape(self, tree: Any, leaves: list[list[tuple]]) -> tuple | None:
+        shapes = tuple(self.shape(items) for items in leaves)
+        if None in shapes:
+            return None
+        return tree, shapes
+
+    def plan_conditions(
+        self, tree: Any, leaves: list[list[tuple]], bound: bool = True
+    ) -> list:
+        def build(node):
+            if isinstance(node, int):
+                conditions = self._leaf_conditions(node, leaves[node], bound)
+                if not conditions:
+                    return true()
+                return conditions[0] if len(conditions) == 1 else and_(*conditions)
+            op, children = node
+            if op == "not":
+                return not_(build(children[0]))
+            return _JOINS[op](*(build(child) for child in children))
+
+        if isinstance(tree, int):
+            # простий фільтр: плаский список умов, як у WHERE a AND b
+            return self._leaf_conditions(tree, leaves[tree], bound)
+        return [build(tree)]
+
+    def plan_params(self, leaves: list[list[tuple]]) -> dict[str, Any]:
+        params = {}
+        for i, items in enumerate(leaves):
+            params.update(self.to_params(items, self._prefix(i)))
+        return params
+
+    def _leaf_conditions(self, i: int, items: list[tuple], bound: bool) -> list:
+        if bound:
+            return self.to_bound_conditions(items, self._prefix(i))
+        return [
+            op.apply(column, self.python_type(name, column))
+            for name, column, op in items
+        ]
 
-            conditions.append(op.apply(column))
-        return conditions
+    @staticmethod
+    def _prefix(i: int) -> str:
+        # одне поле може бути в кількох листах, тому ключ включає номер листа
+        return f"f{i}_"
@@ -0,0 +1,306 @@
+"""
+Порадник індексів: звіряє колонки, за якими репозиторії фільтрують і
+сортують, з індексами в `Base.metadata`.
+
+    python -m src.index_advisor
+
+Джерела використань:
+  * виклики `<uow>.<repo>.find/find_all/count/search(поле=...)` у коді src/ —
+    гарячі шляхи, кожен має бути покритий індексом (див. tests/test_index_advisor.py);
+  * `cursor_fields` репозиторію — порядок `find_all`;
+  * поля підкласів `Filter` (фільтри з query-string) і зовнішні ключі — довідково.
+"""
+
+import ast
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from sqlalchemy import MetaData, Table, UniqueConstraint
+
+from src.config import settings
+from src.database import Base
+from src.filter import Filter
+
+if TYPE_CHECKING:
+    # репозиторій сам перевіряє порядок через index_order
+    from src.repository import RepositoryORM
+
+# аргументи find/find_all/count/search, що не є полями фільтра
+OPTIONS = frozenset(
+    {
+        "filter",
+        "limit",
+        "offset",
+        "after",
+        "columns",
+        "load",
+        "total",
+        "estimated",
+        "order_by",
+        "require_index",
+    }
+)
+QUERIES = {"find": False, "count": False, "search": False, "find_all": True}
+
+
+class Usage(NamedTuple):
+    table: str
+    # поля з умовою на рівність/діапазон
+    columns: tuple[str, ...]
+    # ORDER BY запиту
+    order: tuple[str, ...]
+    source: str
+    hot: bool
+
+
+class Advice(NamedTuple):
+    usage: Usage
+    name: str
+    columns: tuple[str, ...]
+
+    @property
+    def definition(self) -> str:
+        """Для `__table_args__` моделі."""
+        return f"Index({self.name!r}, {', '.join(map(repr, self.columns))})"
+
+    @property
+    def ddl(self) -> str:
+        """Для вже створеної бази."""
+        return (
+            f"CREATE INDEX IF NOT EXISTS {self.name} "
+            f"ON {self.usage.table} ({', '.join(self.columns)})"
+        )
+
+
+def _repositories() -> dict[str, type["RepositoryORM"]]:
+    from src.unit_of_work import SqlAlchemyUnitOfWork
+
+    return dict(SqlAlchemyUnitOfWork.repositories)
+
+
+def collect_call_sites(
+    paths: Iterable[Path] | None = None,
+    repositories: dict[str, type["RepositoryORM"]] | None = None,
+) -> list[Usage]:
+    """Іменовані фільтри у викликах репозиторіїв через unit of work."""
+    repositories = repositories if repositories is not None else _repositories()
+    root = settings.path_root
+    if paths is None:
+        paths = sorted((root / "src").rglob("*.py"))
+    usages = []
+    for path in paths:
+        tree = ast.parse(Path(path).read_text(), filename=str(path))
+        for node in ast.walk(tree):
+            if not (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in QUERIES
+                and isinstance(node.func.value, ast.Attribute)
+                and node.func.value.attr in repositories
+            ):
+                continue
+            repository = repositories[node.func.value.attr]
+            columns = tuple(
+                kw.arg for kw in node.keywords if kw.arg and kw.arg not in OPTIONS
+            )
+            order = ()
+            if QUERIES[node.func.attr]:
+                order = _literal_order(node) or tuple(repository.cursor_fields)
+            try:
+                source = f"{Path(path).relative_to(root)}:{node.lineno}"
+            except ValueError:
+                source = f"{path}:{node.lineno}"
+            usages.append(
+                Usage(
+                    repository.model.__tablename__,
+                    columns,
+                    order,
+                    source,
+                    True,
+                )
+            )
+    return usages
+
+
+def _literal_order(node: ast.Call) -> tuple[str, ...]:
+    # order_by="-created_at" або order_by=("start_time", "id") прямо у виклику
+    for kw in node.keywords:
+        if kw.arg != "order_by":
+            continue
+        try:
+            value = ast.literal_eval(kw.value)
+        except ValueError:
+            return ()
+        if isinstance(value, str):
+            value = value.split(",")
+        return tuple(item.strip().lstrip("-") for item in value)
+    return ()
+
+
+def collect_filters(
+    repositories: dict[str, type["RepositoryORM"]] | None = None,
+) -> list[Usage]:
+    """
+    Поля підкласів `Filter`. Модель визначається за пакетом: фільтр з
+    src/<пакет>/router.py належить репозиторію з src/<пакет>/repository.py.
+    """
+    repositories = repositories if repositories is not None else _repositories()
+    by_package = {
+        repo.__module__.split(".")[1]: repo
+        for repo in repositories.values()
+        if repo.__module__.startswith("src.")
+    }
+    usages = []
+    stack = list(Filter.__subclasses__())
+    while stack:
+        cls = stack.pop()
+        stack.extend(cls.__subclasses__())
+        parts = cls.__module__.split(".")
+        repository = by_package.get(parts[1]) if parts[0] == "src" else None
+        if repository is None:
+            continue
+        columns = repository.model.__table__.columns
+        for field in cls._fields:
+            if field in columns:
+                usages.append(
+                    Usage(
+                        repository.model.__tablename__,
+                        (field,),
+                        (),
+                        f"{cls.__module__}.{cls.__name__}",
+                        False,
+                    )
+                )
+    return usages
+
+
+def collect_foreign_keys(metadata: MetaData = Base.metadata) -> list[Usage]:
+    """FK: по них ідуть завантаження зв'язків і каскадні видалення."""
+    return [
+        Usage(table.name, (fk.parent.name,), (), f"FK {fk.target_fullname}", False)
+        for table in metadata.sorted_tables
+        for fk in table.foreign_keys
+    ]
+
+
+def _index_columns(table: Table) -> list[tuple[tuple[str, ...], bool]]:
+    indexes = [(tuple(col.name for col in table.primary_key.columns), True)]
+    indexes += [
+        (tuple(col.name for col in index.columns), bool(index.unique))
+        for index in table.indexes
+    ]
+    indexes += [
+        (tuple(col.name for col in constraint.columns), True)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+    return [(columns, unique) for columns, unique in indexes if columns]
+
+
+def index_key(usage: Usage, table: Table) -> tuple[str, ...]:
+    """Колонки індексу: спершу умови, потім сортування без хвостового pk."""
+    pk = {col.name for col in table.primary_key.columns}
+    order = [name for name in usage.order if name not in usage.columns]
+    while order and order[-1] in pk:
+        order.pop()
+    return tuple(dict.fromkeys(usage.columns)) + tuple(order)
+
+
+def is_covered(usage: Usage, table: Table) -> bool:
+    """
+    Чи є індекс, яким запит може скористатися: його перші колонки — усі поля
+    умови (у будь-якому порядку), далі — перша колонка сортування.
+    Унікальний індекс, усі колонки якого в умові, покриває запит повністю.
+    """
+    key = index_key(usage, table)
+    if not key:
+        return True
+    columns = set(usage.columns)
+    indexes = _index_columns(table)
+    if any(unique and set(index) <= columns for index, unique in indexes):
+        return True
+    n = len(set(usage.columns))
+    return any(
+        set(index[:n]) == set(key[:n]) and index[n : len(key)] == key[n : len(key)]
+        for index, _ in indexes
+    )
+
+
+def index_order(
+    table: Table, columns: Iterable[str], order: Iterable[tuple[str, bool]]
+) -> bool:
+    """
+    Чи віддає якийсь індекс рядки вже в порядку `order` ((колонка, desc), ...)
+    за умов на рівність по `columns`: колонки індексу до першої колонки
+    сортування мають бути серед `columns`, далі — сортування по порядку.
+    Хвостовий pk і колонки з рівністю не враховуються. Індекси моделей —
+    за зростанням, тож напрямок має бути однаковим (назад індекс читається).
+    """
+    columns = set(columns)
+    pk = {col.name for col in table.primary_key.columns}
+    order = [(name, desc) for name, desc in order if name not in columns]
+    while order and order[-1][0] in pk:
+        order.pop()
+    if not order:
+        return True
+    if len({desc for _, desc in order}) > 1:
+        return False
+    names = tuple(name for name, _ in order)
+    for index, _ in _index_columns(table):
+        for start in range(len(index)):
+            if index[start : start + len(names)] == names:
+                if set(index[:start]) <= columns:
+                    return True
+                break
+    return False
+
+
+def advise(
+    usages: Iterable[Usage], metadata: MetaData = Base.metadata
+) -> list[Advice]:
+    """Непокриті використання з пропозицією індексу, без дублікатів."""
+    advice: dict[tuple[str, tuple[str, ...]], Advice] = {}
+    for usage in usages:
+        table = metadata.tables.get(usage.table)
+        if table is None or is_covered(usage, table):
+            continue
+        key = index_key(usage, table)
+        previous = advice.get((usage.table, key))
+        if previous is None or (usage.hot and not previous.usage.hot):
+            name = f"ix_{usage.table}_{'_'.join(key)}"
+            advice[(usage.table, key)] = Advice(usage, name, key)
+    return list(advice.values())
+
+
+def report(metadata: MetaData = Base.metadata) -> list[Advice]:
+    return advise(
+        collect_call_sites() + collect_filters() + collect_foreign_keys(metadata),
+        metadata,
+    )
+
+
+def main():
+    # роутери реєструють підкласи Filter
+    import src.main  # noqa: F401
+
+    advice = report()
+    if not advice:
+        print("All filtered and ordered columns are indexed.")
+        return
+    for hot in (True, False):
+        items = [a for a in advice if a.usage.hot is hot]
+        if not items:
+            continue
+        print("# Hot queries without index" if hot else "# Filterable columns / FK")
+        for item in items:
+            usage = item.usage
+            where = ", ".join(usage.columns) or "-"
+            order = ", ".join(usage.order) or "-"
+            print(f"{usage.table}: where {where}; order by {order}  ({usage.source})")
+            print(f"    {item.definition}")
+            print(f"    {item.ddl};")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import TYPE_CHECKING, Generic, Protocol, TypeVar
+from typing import TYPE_CHECKING, Generic, Literal, Protocol, TypeVar
 
-from src.filter import Filter, Op
+from pydantic import BaseModel
+
+from src.filter import Filter, FilterExpr, Op
 
 if TYPE_CHECKING:
     from src.auth.interface import IRefreshTokenRepository
@@ -20,12 +22,45 @@ class IRepository(Generic[T], Protocol):
 
     async def add(self, data) -> T: ...
 
-    async def find(self, filter: Filter = Filter(), **filters: Op) -> T | None: ...
+    async def add_many(self, rows: list[dict], chunk_size: int = 1000) -> list[T]: ...
+
+    async def find(
+        self,
+        filter: Filter | FilterExpr | None = None,
+        load: dict[str, str] | list[str] | None = None,
+        **filters: Op,
+    ) -> T | None: ...
 
     async def find_all(
-        self, offset: int = 0, limit: int = 10, filter: Filter = Filter(), **filters: Op
+        self,
+        offset: int = 0,
+        limit: int = 10,
+        filter: Filter | FilterExpr | None = None,
+        after: str | None = None,
+        columns: list[str] | type[BaseModel] | None = None,
+        load: dict[str, str] | list[str] | None = None,
+        total: Literal["exact", "estimated"] | None = None,
+        order_by: str | list[str] | tuple[str, ...] | None = None,
+        require_index: bool = False,
+        **filters: Op,
+    ) -> list[T]: ...
+
+    async def count(
+        self, filter: Filter | FilterExpr | None = None, estimated: bool = False, **filters: Op
+    ) -> int: ...
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        after: str | None = None,
+        filter: Filter | FilterExpr | None = None,
+        columns: list[str] | type[BaseModel] | None = None,
+        **filters: Op,
     ) -> list[T]: ...
 
+    async def load(self, _id: int) -> T | None: ...
+
     async def update(self, _id: int, data:dict) -> T: ...
 
     async def delete(self, _id: int) -> T | None: ...
@@ -38,6 +73,7 @@ class IUnitOfWork(Generic[T],Protocol):
     events:"IEventRepository"
     tickets: "ITicketsRepository"
     seats: "ISeatsRepository"
+    def read_only(self) -> "IUnitOfWork": ...
     async def __aenter__(self) -> "IUnitOfWork": ...
     async def __aexit__(self, *args) -> None: ...
 
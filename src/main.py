@@ -1,8 +1,11 @@
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from src.auth.jwt_codec import install_reload_signal
+from src.exceptions import InvalidQueryError
 from src.utils import load_routers
 
 log = logging.getLogger(__name__)
@@ -18,6 +21,13 @@ app.add_middleware(
 )
 
 load_routers(app)
+install_reload_signal()
+
+
+@app.exception_handler(InvalidQueryError)
+async def invalid_query_handler(request: Request, exc: InvalidQueryError):
+    """Некоректний фільтр або курсор — помилка клієнта, а не сервера."""
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 
 @app.get("/")
@@ -0,0 +1,109 @@
+from collections.abc import Mapping
+from typing import Any, Callable, Iterable, Sequence, TypeVar
+
+from src.exceptions import InvalidQueryError
+from src.filter import Filter, FilterExpr, and3, not3, or3
+
+R = TypeVar("R")
+Truth = bool | None
+Mask = list[Truth]
+
+
+def _field(row: Any, name: str) -> Any:
+    if isinstance(row, Mapping):
+        try:
+            return row[name]
+        except KeyError:
+            raise InvalidQueryError(f"Row has no field '{name}'") from None
+    try:
+        return getattr(row, name)
+    except AttributeError:
+        raise InvalidQueryError(f"Row has no field '{name}'") from None
+
+
+def compile_rows(expr: Filter | FilterExpr) -> Callable[[Any], Truth]:
+    """
+    Перетворює фільтр на функцію рядок -> True/False/None з тією ж
+    семантикою, що й SQL з FilterHeadler. Оператори готуються один раз.
+    """
+    if isinstance(expr, Filter):
+        predicates = [(name, op.predicate()) for name, op in expr.to_dict().items()]
+
+        def leaf(row) -> Truth:
+            result: Truth = True
+            for name, predicate in predicates:
+                result = and3(result, predicate(_field(row, name)))
+                if result is False:
+                    break
+            return result
+
+        return leaf
+    children = [compile_rows(child) for child in expr.children]
+    if expr.op == "not":
+        child = children[0]
+        return lambda row: not3(child(row))
+    combine = and3 if expr.op == "and" else or3
+
+    def node(row) -> Truth:
+        result = children[0](row)
+        for child in children[1:]:
+            result = combine(result, child(row))
+        return result
+
+    return node
+
+
+def matches(expr: Filter | FilterExpr, row: Any) -> bool:
+    """Чи пройшов би рядок WHERE з цим фільтром."""
+    return compile_rows(expr)(row) is True
+
+
+def filter_rows(expr: Filter | FilterExpr, rows: Iterable[R]) -> list[R]:
+    """Рядки (ORM-об'єкти, Row, dict), що проходять фільтр, у вихідному порядку."""
+    predicate = compile_rows(expr)
+    return [row for row in rows if predicate(row) is True]
+
+
+def column_mask(
+    expr: Filter | FilterExpr, columns: Mapping[str, Sequence[Any]]
+) -> list[bool]:
+    """
+    Колонкове обчислення: `columns` — {поле: масив значень} однакової довжини.
+    Кожен оператор проходить свою колонку одним map без звернень до рядків.
+    """
+    sizes = {len(values) for values in columns.values()}
+    if len(sizes) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(sizes)}")
+    size = sizes.pop() if sizes else 0
+    return [value is True for value in _mask(expr, columns, size)]
+
+
+def filter_columns(
+    expr: Filter | FilterExpr, columns: Mapping[str, Sequence[Any]]
+) -> dict[str, list[Any]]:
+    """Колонки, залишені лише з рядками, що проходять фільтр."""
+    mask = column_mask(expr, columns)
+    return {
+        name: [value for value, keep in zip(values, mask) if keep]
+        for name, values in columns.items()
+    }
+
+
+def _mask(
+    expr: Filter | FilterExpr, columns: Mapping[str, Sequence[Any]], size: int
+) -> Mask:
+    if isinstance(expr, Filter):
+        mask: Mask = [True] * size
+        for name, op in expr.to_dict().items():
+            if name not in columns:
+                raise InvalidQueryError(f"Columns have no field '{name}'")
+            mask = list(map(and3, mask, map(op.predicate(), columns[name])))
+        return mask
+    masks = [_mask(child, columns, size) for child in expr.children]
+    if expr.op == "not":
+        return list(map(not3, masks[0]))
+    combine = and3 if expr.op == "and" else or3
+    mask = masks[0]
+    for other in masks[1:]:
+        mask = list(map(combine, mask, other))
+    return mask
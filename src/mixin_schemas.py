@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Generic, TypeVar
+from typing import Generic, Literal, TypeVar
 from pydantic import BaseModel, Field
 
 
@@ -10,6 +10,12 @@ class CreatedAtMixin(BaseModel):
 class Pagination(BaseModel):
     offset: int = Field(default=0, gte=0)
     limit: int = Field(default=10, ge=0, le=200)
+    after: str | None = Field(
+        default=None, description="Курсор з `next_cursor` попередньої сторінки"
+    )
+    count: Literal["exact", "estimated"] | None = Field(
+        default=None, description="Повернути загальну кількість у `total`"
+    )
 
 
 T = TypeVar("T")
@@ -18,3 +24,5 @@ T = TypeVar("T")
 class Collection(Pagination, Generic[T]):
     collection: list[T]
     size: int
+    next_cursor: str | None = None
+    total: int | None = None
@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+
+from src.auth.dependencies import AuthAdmin
+from src.auth.jwt_codec import get_jwt_codec
+from src.auth.token_cache import verified_tokens
+from src.database import engine, replica_engines
+from src.pool_metrics import pool_status
+from src.query_diagnostics import query_diagnostics
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+
+@router.get("/db/pool", summary="Стан пулів з'єднань (Admin only)")
+async def db_pool(current_user: AuthAdmin):
+    return {
+        "primary": pool_status(engine.sync_engine.pool),
+        "replicas": [pool_status(e.sync_engine.pool) for e in replica_engines],
+    }
+
+
+@router.get("/db/slow-queries", summary="Повільні запити репозиторіїв (Admin only)")
+async def slow_queries(current_user: AuthAdmin):
+    return query_diagnostics.snapshot()
+
+
+@router.delete("/db/slow-queries", summary="Очистити журнал повільних запитів (Admin only)")
+async def clear_slow_queries(current_user: AuthAdmin):
+    query_diagnostics.clear()
+    return {"ok": True}
+
+
+@router.get("/auth/token-cache", summary="Кеш перевірених токенів (Admin only)")
+async def token_cache(current_user: AuthAdmin):
+    return verified_tokens.info()
+
+
+@router.get("/auth/jwt-keys", summary="Завантаження ключів JWT (Admin only)")
+async def jwt_keys(current_user: AuthAdmin):
+    return get_jwt_codec().keys.metrics()
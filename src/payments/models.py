@@ -16,8 +16,12 @@ class PaymentORM(Base, CreatedAtMixin):
     __tablename__ = "payments"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
-    ticket_id: Mapped[int] = mapped_column(ForeignKey("tickets.id", ondelete="CASCADE"))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    ticket_id: Mapped[int] = mapped_column(
+        ForeignKey("tickets.id", ondelete="CASCADE"), index=True
+    )
     amount: Mapped[float] = mapped_column(nullable=False)
     payment_method: Mapped[str] = mapped_column(nullable=False)
     payment_status: Mapped[str] = mapped_column(nullable=False)
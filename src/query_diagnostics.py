@@ -0,0 +1,196 @@
+import hashlib
+import json
+import logging
+import random
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import Executable
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement
+
+from src.config import settings
+
+log = logging.getLogger(__name__)
+
+
+class explain(Executable, ClauseElement):
+    """
+    EXPLAIN над готовим запитом з тими ж bind-параметрами. analyze=False —
+    лише план і оцінки планувальника, без виконання запиту.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement, analyze: bool = True):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(explain)
+def _explain(element, compiler, **kw):
+    return "EXPLAIN " + compiler.process(element.statement, **kw)
+
+
+@compiles(explain, "postgresql")
+def _explain_pg(element, compiler, **kw):
+    # ANALYZE виконує запит ще раз — тому лише для вибраних повільних
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) " + compiler.process(element.statement, **kw)
+
+
+@compiles(explain, "sqlite")
+def _explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+def fingerprint(sql: str) -> str:
+    """Ідентифікатор форми запиту: значення фільтрів у SQL — bind-параметри."""
+    return hashlib.sha1(sql.encode()).hexdigest()[:16]
+
+
+def param_types(params: dict[str, Any]) -> dict[str, str]:
+    # значення не зберігаються: у фільтрах бувають email, токени тощо
+    types = {}
+    for name, value in params.items():
+        if isinstance(value, (list, tuple, set)):
+            inner = sorted({type(v).__name__ for v in value})
+            types[name] = f"list[{' | '.join(inner)}]"
+        else:
+            types[name] = type(value).__name__
+    return types
+
+
+class QueryDiagnostics:
+    """
+    Вибірковий замір find/find_all: частка `sample_rate` запитів заміряється,
+    для тих, що довші за `threshold_ms`, зберігається SQL, типи параметрів і
+    план (EXPLAIN ANALYZE на Postgres, EXPLAIN QUERY PLAN на SQLite).
+    """
+
+    def __init__(
+        self, sample_rate: float = 0.0, threshold_ms: float = 500.0, maxlen: int = 100
+    ):
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+        self.maxlen = maxlen
+        self._lock = Lock()
+        self._recent: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        self._fingerprints: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.sampled = 0
+        self.slow = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def sample(self) -> bool:
+        if self.sample_rate <= 0 or (
+            self.sample_rate < 1 and random.random() >= self.sample_rate
+        ):
+            return False
+        with self._lock:
+            self.sampled += 1
+        return True
+
+    def is_slow(self, seconds: float) -> bool:
+        return seconds * 1000 >= self.threshold_ms
+
+    async def capture(
+        self,
+        session: AsyncSession,
+        stmt,
+        params: dict[str, Any],
+        source: str,
+        seconds: float,
+    ) -> dict[str, Any]:
+        """Знімає план повільного запиту, зберігає запис і пише його в лог."""
+        conn = await session.connection()
+        dialect = conn.dialect
+        sql = str(stmt.compile(dialect=dialect))
+        record: dict[str, Any] = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "source": source,
+            "fingerprint": fingerprint(sql),
+            "sql": sql,
+            "param_types": param_types(params),
+            "duration_ms": round(seconds * 1000, 3),
+            "plan": None,
+        }
+        # помилка в транзакції Postgres ламає її до кінця — EXPLAIN у savepoint
+        nested = conn.begin_nested() if dialect.name == "postgresql" else nullcontext()
+        try:
+            async with nested:
+                res = await conn.execute(explain(stmt), params)
+                if dialect.name == "postgresql":
+                    plan = res.scalar_one()
+                    record["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+                else:
+                    # SQLite: (id, parent, notused, detail)
+                    record["plan"] = [row[-1] for row in res]
+        except SQLAlchemyError as e:
+            record["error"] = str(e)
+        self.record(record)
+        log.warning(
+            "Slow query %s in %s: %.1f ms",
+            record["fingerprint"],
+            source,
+            record["duration_ms"],
+            extra={"slow_query": record},
+        )
+        return record
+
+    def record(self, record: dict[str, Any]):
+        with self._lock:
+            self.slow += 1
+            self._recent.append(record)
+            stats = self._fingerprints.pop(record["fingerprint"], None)
+            if stats is None:
+                stats = {
+                    "fingerprint": record["fingerprint"],
+                    "source": record["source"],
+                    "sql": record["sql"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            stats["count"] += 1
+            stats["total_ms"] += record["duration_ms"]
+            stats["max_ms"] = max(stats["max_ms"], record["duration_ms"])
+            # найсвіжіші в кінці, найстаріші витісняються
+            self._fingerprints[record["fingerprint"]] = stats
+            while len(self._fingerprints) > self.maxlen:
+                self._fingerprints.popitem(last=False)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "threshold_ms": self.threshold_ms,
+                "sampled": self.sampled,
+                "slow": self.slow,
+                "fingerprints": sorted(
+                    (dict(stats) for stats in self._fingerprints.values()),
+                    key=lambda stats: stats["total_ms"],
+                    reverse=True,
+                ),
+                "recent": list(self._recent),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._fingerprints.clear()
+            self.sampled = self.slow = 0
+
+
+query_diagnostics = QueryDiagnostics(
+    sample_rate=settings.db.slow_query_sample_rate,
+    threshold_ms=settings.db.slow_query_ms,
+    maxlen=settings.db.slow_query_log_size,
+)
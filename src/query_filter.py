@@ -0,0 +1,131 @@
+from datetime import datetime
+from typing import Any, Iterable
+
+from fastapi import Query, Request
+from pydantic import TypeAdapter, ValidationError
+
+from src.exceptions import InvalidQueryError
+from src.filter import OPERATORS, Filter, FilterExpr
+from src.mixin_schemas import Pagination
+
+SEPARATOR = "__"
+ORDER_PARAM = "order_by"
+# оператори, значення яких — список через кому
+LIST_OPERATORS = {"in": None, "between": 2}
+
+
+class QueryFilter:
+    """
+    FastAPI-залежність: розбирає `?field__op=value` у `Filter` ресурсу.
+    Поля та оператори задаються білим списком роутера, все інше — 400
+    ще до запиту в БД.
+
+        EventQuery = QueryFilter(EventFilter, location=("eq", "in"))
+
+        async def handler(filter: Filter | None = Depends(EventQuery)): ...
+    """
+
+    def __init__(
+        self,
+        filter_cls: type[Filter],
+        reserved: Iterable[str] = (),
+        **fields: Iterable[str],
+    ):
+        self.filter_cls = filter_cls
+        # інші query-параметри ендпоінта, які не є фільтрами
+        self.reserved = set(Pagination.model_fields) | {ORDER_PARAM} | set(reserved)
+        self.fields: dict[str, tuple[TypeAdapter, frozenset[str]]] = {}
+        for name, ops in fields.items():
+            spec = filter_cls._fields.get(name)
+            if spec is None:
+                raise ValueError(f"{filter_cls.__name__} has no field '{name}'")
+            unknown = set(ops) - set(OPERATORS)
+            if unknown:
+                raise ValueError(f"Unknown operators {sorted(unknown)} for '{name}'")
+            self.fields[name] = (TypeAdapter(spec.type_), frozenset(ops))
+
+    def __call__(self, request: Request) -> Filter | FilterExpr | None:
+        leaves: list[Filter] = []
+        for key, raw in request.query_params.multi_items():
+            if key in self.reserved:
+                continue
+            field, op = self.parse(key, raw)
+            # одне поле з кількома операторами (start_time__gte & __lte)
+            # потрапляє в окремий лист, що додається через AND
+            for leaf in leaves:
+                if field not in leaf.to_dict():
+                    leaf.overload(**{field: op})
+                    break
+            else:
+                leaves.append(self.filter_cls().overload(**{field: op}))
+        if not leaves:
+            return None
+        expr = leaves[0]
+        for leaf in leaves[1:]:
+            expr = expr & leaf
+        return expr
+
+    def parse(self, key: str, raw: str) -> tuple[str, Any]:
+        field, _, op_name = key.partition(SEPARATOR)
+        op_name = op_name or "eq"
+        if field not in self.fields:
+            raise InvalidQueryError(f"Unknown filter field '{field}'")
+        adapter, allowed = self.fields[field]
+        if op_name not in allowed:
+            raise InvalidQueryError(
+                f"Operator '{op_name}' is not allowed for '{field}'"
+            )
+        if op_name in LIST_OPERATORS:
+            values = [self._value(field, adapter, v) for v in raw.split(",")]
+            size = LIST_OPERATORS[op_name]
+            if size is not None and len(values) != size:
+                raise InvalidQueryError(
+                    f"'{key}' expects {size} comma-separated values"
+                )
+            value = tuple(values) if size else values
+        else:
+            value = self._value(field, adapter, raw)
+        return field, OPERATORS[op_name](value)
+
+    @staticmethod
+    def _value(field: str, adapter: TypeAdapter, raw: str) -> Any:
+        try:
+            value = adapter.validate_python(raw)
+        except ValidationError as e:
+            raise InvalidQueryError(f"Invalid value '{raw}' for '{field}'") from e
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            # колонки TIMESTAMP WITHOUT TIME ZONE, як і в EventService
+            value = value.replace(tzinfo=None)
+        return value
+
+
+class QueryOrder:
+    """
+    FastAPI-залежність: `?order_by=-created_at,id` у кортеж для
+    `find_all(order_by=...)`. Сортувати можна лише за полями білого списку
+    ресурсу — тими, під які є індекс.
+
+        EventOrder = QueryOrder("start_time")
+
+        async def handler(order_by=Depends(EventOrder)): ...
+    """
+
+    def __init__(self, *fields: str, default: tuple[str, ...] | None = None):
+        self.fields = frozenset(fields)
+        self.default = default
+
+    def __call__(
+        self,
+        order_by: str | None = Query(
+            default=None,
+            description="Поля через кому, `-` — за спаданням: `-start_time,id`",
+        ),
+    ) -> tuple[str, ...] | None:
+        if not order_by:
+            return self.default
+        items = tuple(item.strip() for item in order_by.split(","))
+        for item in items:
+            name = item.lstrip("-")
+            if name not in self.fields:
+                raise InvalidQueryError(f"Ordering by '{name}' is not allowed")
+        return items
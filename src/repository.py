@@ -1,12 +1,42 @@
-from typing import Any, Callable, TypeVar
-from sqlalchemy import Result, Select, Tuple, delete, insert, select, update
+import json
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Callable, Literal, TypeVar
+from sqlalchemy import (
+    Result,
+    Select,
+    Tuple,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.exc import StatementError, IntegrityError, SQLAlchemyError
 
+from src.cursor import decode_cursor, encode_cursor
 from src.database import Base
-from src.exceptions import IntegrityRepositoryError, InvalidQueryError, RepositoryError
-from src.filter import Filter, FilterHeadler, Op
+from src.exceptions import (
+    IntegrityRepositoryError,
+    InvalidQueryError,
+    ReadOnlyError,
+    RepositoryError,
+)
+from src.dataloader import DataLoader
+from src.filter import Filter, FilterExpr, FilterHeadler, Op, equality_fields, in_
+from src.index_advisor import index_order
+from src.search import match, rank, search_terms
 from src.interface import IRepository
+from src.query_diagnostics import QueryDiagnostics, explain, query_diagnostics
+from src.statement_cache import StatementCache
 from typing import TypeVar, Generic
 
 from src.users.models import UserORM
@@ -29,44 +59,373 @@ def execute(func: Callable):
 
 T = TypeVar("T", bound=Base)
 
+LOAD_STRATEGIES = {"selectin": selectinload, "joined": joinedload}
+Load = dict[str, str] | list[str] | tuple[str, ...] | None
+# "start_time" — за зростанням, "-created_at" — за спаданням
+OrderBy = str | list[str] | tuple[str, ...] | None
+Order = tuple[tuple[str, bool], ...]
+
+
+class Page(list):
+    """Сторінка результатів `find_all` з курсором на наступну сторінку."""
+
+    next_cursor: str | None = None
+    total: int | None = None
+
 
 class RepositoryORM(Generic[T]):
     model: type[T] = None
+    # Стабільний порядок для курсорної пагінації: індексована колонка + id
+    cursor_fields: tuple[str, ...] = ("id",)
+    # колонки, дозволені в find_all(order_by=...), крім id: порядок і курсор
+    # розкривають значення, тож чутливі поля (паролі, токени) сюди не додаються
+    orderable: tuple[str, ...] = ()
+    statement_cache_size: int = 256
+    _statements: StatementCache = StatementCache()
+    # вибірковий EXPLAIN повільних find/find_all, див. src/query_diagnostics.py
+    diagnostics: QueryDiagnostics = query_diagnostics
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # кеш і метадані моделі спільні для всіх екземплярів у межах процесу
+        cls._statements = StatementCache(cls.statement_cache_size)
+        if cls.model is not None:
+            cls._filter = FilterHeadler(cls.model)
+            columns = cls.model.__table__.c
+            for name in cls.orderable:
+                # keyset-умова `col > :after` пропускає рядки з NULL
+                if name not in columns or columns[name].nullable:
+                    raise ValueError(
+                        f"{cls.__name__}.orderable: '{name}' must be a NOT NULL "
+                        f"column of {cls.model.__tablename__}"
+                    )
 
     def __init__(self, session: AsyncSession):
         if self.model is None:
             raise NotImplementedError("Repository must specify a model class.")
         self.session = session
-        self._filter = FilterHeadler(self.model)
+        # кеш load(id) живе стільки ж, скільки репозиторій — один unit of work
+        self._loader: DataLoader[Any, T] = DataLoader(self._load_batch)
 
     @execute
-    async def find_all(self, limit=10, offset=0, filter: Filter = Filter(), **filters):
-        stmt = await self.__find(_filter=filter, filters=filters)
-        stmt = stmt.offset(offset).limit(limit)
-        res = await self.session.execute(stmt)
-        return res.scalars().all()
+    async def find_all(
+        self,
+        limit=10,
+        offset=0,
+        filter: Filter | FilterExpr | None = None,
+        after: str | None = None,
+        columns: list[str] | type[BaseModel] | None = None,
+        load: Load = None,
+        total: Literal["exact", "estimated"] | None = None,
+        order_by: OrderBy = None,
+        require_index: bool = False,
+        **filters,
+    ):
+        """
+        columns — проєкція: список полів або pydantic-схема відповіді.
+        Тоді повертаються легкі `Row` замість ORM-об'єктів (без identity map).
+        load — зв'язки, що завантажуються разом з рядками, див. `_load_options`.
+        total — заповнити `Page.total`: "exact" рахує віконною функцією в тому ж
+        запиті, "estimated" бере оцінку планувальника (див. `count`).
+        order_by — колонки сортування, "-" — за спаданням; за замовчуванням
+        `cursor_fields`. id додається в кінець для стабільного порядку.
+        require_index — InvalidQueryError, якщо жоден індекс не віддає рядки
+        в цьому порядку (тоді LIMIT означав би сортування всієї вибірки).
+        """
+        if columns is not None and load:
+            raise InvalidQueryError("Relationships can`t be loaded for projection")
+        order = self._order(order_by)
+        if require_index:
+            self._check_order_index(order, filter, filters)
+        cursor = decode_cursor(after) if after else None
+        # з курсором вікно бачить лише рядки після нього, тому рахуємо окремо
+        window = total == "exact" and cursor is None
+        stmt, params = self.__find(
+            _filter=filter,
+            filters=filters,
+            page=True,
+            after=cursor is not None,
+            columns=self._projection(columns, order),
+            load=self._load_options(load),
+            total=window,
+            order=order,
+        )
+        params["_limit"] = limit
+        if cursor is None:
+            params["_offset"] = offset
+        else:
+            # keyset-пагінація: offset ігнорується, позиція береться з курсора
+            params.update(self._cursor_params(cursor, order))
+        res = await self._execute(stmt, params, "find_all")
+        if columns is not None:
+            rows = res.all()
+            page = Page(rows)
+        else:
+            rows = res.unique().all()
+            page = Page(row[0] for row in rows)
+        if limit and len(page) == limit:
+            page.next_cursor = self._cursor(page[-1], order)
+        if window and rows:
+            page.total = rows[0]._total
+        elif total:
+            page.total = await self.count(
+                filter, estimated=total == "estimated", **filters
+            )
+        return page
+
+    @execute
+    async def count(
+        self, filter: Filter | FilterExpr | None = None, estimated: bool = False, **filters: Op
+    ) -> int:
+        """
+        Кількість рядків під фільтром. estimated=True на Postgres читає оцінку
+        планувальника (EXPLAIN) замість повного підрахунку; на інших СУБД
+        рахує точно.
+        """
+        dialect = self.session.get_bind().dialect
+        if estimated and dialect.name == "postgresql":
+            stmt, params = self.__find(_filter=filter, filters=filters)
+            return await self._estimate(stmt, params)
+        stmt, params = self.__find(_filter=filter, filters=filters, count=True)
+        res = await self.session.execute(stmt, params)
+        return res.scalar_one()
+
+    async def _estimate(self, stmt: Select, params: dict) -> int:
+        res = await self.session.execute(explain(stmt, analyze=False), params)
+        plan = res.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @execute
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        after: str | None = None,
+        filter: Filter | FilterExpr | None = None,
+        columns: list[str] | type[BaseModel] | None = None,
+        **filters: Op,
+    ) -> Page:
+        """
+        Повнотекстовий пошук по `document` моделі (див. src/search.py),
+        найрелевантніші першими. Пагінація лише курсором: (релевантність, id).
+        """
+        document = getattr(self.model, "document", None)
+        if document is None:
+            raise InvalidQueryError(f"{self.model.__name__} is not searchable")
+        cursor = decode_cursor(after) if after else None
+        if cursor is not None and len(cursor) != 2:
+            raise InvalidQueryError("Cursor does not match search ordering")
+        stmt, params = self.__find(
+            _filter=filter, filters=filters, columns=self._projection(columns)
+        )
+        q = bindparam("_q", type_=document.type)
+        score = rank(document, q)
+        stmt = (
+            stmt.add_columns(score.label("_rank"))
+            .where(match(document, q))
+            .order_by(score.desc(), self.model.id)
+            .limit(bindparam("_limit"))
+        )
+        params.update(_q=search_terms(query), _limit=limit)
+        if cursor is not None:
+            after_rank = bindparam("_after_rank")
+            stmt = stmt.where(
+                or_(
+                    score < after_rank,
+                    and_(score == after_rank, self.model.id > bindparam("_after_id")),
+                )
+            )
+            params.update(_after_rank=cursor[0], _after_id=cursor[1])
+        res = await self.session.execute(stmt, params)
+        if columns is not None:
+            rows = res.all()
+            page = Page(rows)
+        else:
+            rows = res.unique().all()
+            page = Page(row[0] for row in rows)
+        if limit and len(rows) == limit:
+            last = rows[-1]
+            page.next_cursor = encode_cursor([last._rank, page[-1].id])
+        return page
+
+    def cursor_for(self, instance: T, order_by: OrderBy = None) -> str:
+        """Курсор, що вказує на позицію одразу після `instance`."""
+        return self._cursor(instance, self._order(order_by))
+
+    @staticmethod
+    def _cursor(instance: T, order: Order) -> str:
+        return encode_cursor([getattr(instance, name) for name, _ in order])
+
+    def _cursor_params(self, values: list, order: Order) -> dict[str, Any]:
+        columns = self._cursor_columns(order)
+        if len(values) != len(columns):
+            raise InvalidQueryError("Cursor does not match repository ordering")
+        return {
+            f"_after_{i}": self._cursor_value(col, v)
+            for i, ((col, _), v) in enumerate(zip(columns, values))
+        }
+
+    def _order(self, order_by: OrderBy) -> Order:
+        """Нормалізує `order_by` до ключа кешу: ((колонка, desc), ...)."""
+        if order_by is None:
+            return tuple((name, False) for name in self.cursor_fields)
+        if isinstance(order_by, str):
+            order_by = order_by.split(",")
+        order: dict[str, bool] = {}
+        for item in order_by:
+            item = item.strip()
+            name = item.lstrip("-")
+            if name != "id" and name not in self.orderable:
+                raise InvalidQueryError(
+                    f"{self.model.__name__} can`t be ordered by '{name}'"
+                )
+            if name in order:
+                raise InvalidQueryError(f"Column '{name}' is repeated in order_by")
+            order[name] = item.startswith("-")
+        if "id" not in order:
+            # однакові значення розрізняє id — у тому ж напрямку, що й останнє поле
+            order["id"] = list(order.values())[-1] if order else False
+        return tuple(order.items())
+
+    def _check_order_index(
+        self, order: Order, _filter: Filter | FilterExpr | None, filters: dict
+    ):
+        fixed = equality_fields(self._resolve_filter(_filter, filters))
+        if not index_order(self.model.__table__, fixed, order):
+            readable = ", ".join(f"-{n}" if desc else n for n, desc in order)
+            raise InvalidQueryError(
+                f"No index of '{self.model.__tablename__}' serves order by {readable}"
+            )
+
+    @staticmethod
+    def _cursor_value(col, value):
+        if value is not None and col.type.python_type is datetime:
+            try:
+                return datetime.fromisoformat(value)
+            except (TypeError, ValueError) as e:
+                raise InvalidQueryError(f"Invalid cursor value '{value}'") from e
+        return value
+
+    def _load_options(self, load: Load) -> tuple[tuple[str, str], ...]:
+        """
+        Нормалізує `load` до ключа кешу: ((шлях, стратегія), ...).
+        Приймає список шляхів ("tickets", "tickets.seat") — стратегія selectin,
+        або словник {шлях: "selectin" | "joined"}.
+        """
+        if not load:
+            return ()
+        if not isinstance(load, dict):
+            load = {path: "selectin" for path in load}
+        options = []
+        for path, strategy in load.items():
+            if strategy not in LOAD_STRATEGIES:
+                raise InvalidQueryError(f"Unknown load strategy '{strategy}'")
+            options.append((path, strategy))
+        return tuple(sorted(options))
+
+    def _loaders(self, load: tuple[tuple[str, str], ...]) -> list:
+        loaders = []
+        for path, strategy in load:
+            model, loader = self.model, None
+            for name in path.split("."):
+                relationship = inspect(model).relationships.get(name)
+                if relationship is None:
+                    raise InvalidQueryError(
+                        f"{model.__name__} has no relationship '{name}'"
+                    )
+                if loader is None:
+                    factory = LOAD_STRATEGIES[strategy]
+                else:
+                    factory = getattr(loader, f"{strategy}load")
+                loader = factory(getattr(model, name))
+                model = relationship.mapper.class_
+            loaders.append(loader)
+        return loaders
+
+    def _projection(
+        self, columns: list[str] | type[BaseModel] | None, order: Order = ()
+    ):
+        if columns is None:
+            return None
+        mapped = inspect(self.model).columns
+        if isinstance(columns, type) and issubclass(columns, BaseModel):
+            names = [name for name in columns.model_fields if name in mapped]
+        else:
+            unknown = [name for name in columns if name not in mapped]
+            if unknown:
+                raise InvalidQueryError(
+                    f"{self.model.__name__} has no columns {unknown}"
+                )
+            names = list(columns)
+        # поля курсора потрібні для next_cursor
+        names += [name for name, _ in order if name not in names]
+        return tuple(names)
+
+    def _cursor_columns(self, order: Order) -> list[tuple[Any, bool]]:
+        return [(getattr(self.model, name), desc) for name, desc in order]
 
     @execute
     async def find(
         self,
-        filter: Filter = Filter(),
+        filter: Filter | FilterExpr | None = None,
+        load: Load = None,
         **filters: Op,
     ):
 
-        stmt = await self.__find(_filter=filter, filters=filters)
-        res = await self.session.execute(stmt)
-        return res.scalar_one_or_none()
+        stmt, params = self.__find(
+            _filter=filter, filters=filters, load=self._load_options(load)
+        )
+        res = await self._execute(stmt, params, "find")
+        return res.unique().scalar_one_or_none()
+
+    async def load(self, _id: Any) -> T | None:
+        """
+        find(id=eq(_id)) з батчингом: виклики одного проходу event loop
+        (напр. через asyncio.gather) ідуть одним `WHERE id IN (...)`,
+        повторні — з кешу до наступного запису через цей репозиторій.
+        """
+        return await self._loader.load(_id)
+
+    @execute
+    async def _load_batch(self, ids: list) -> dict[Any, T]:
+        stmt, params = self.__find(_filter=None, filters={"id": in_(ids)})
+        res = await self.session.execute(stmt, params)
+        return {instance.id: instance for instance in res.scalars()}
 
     @execute
     async def add(self, data) -> T:
+        self._mark_write()
         instance = self.model(**data)
         self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
+        # flush замість commit: INSERT ... RETURNING повертає id та server
+        # defaults (created_at), а транзакцією керує unit of work
+        await self.session.flush()
+        self._loader.prime(instance.id, instance)
         return instance
 
+    @execute
+    async def add_many(self, rows: list[dict], chunk_size: int = 1000) -> list[T]:
+        """Вставляє рядки пачками одним multi-row INSERT ... RETURNING на пачку."""
+        self._mark_write()
+        created: list[T] = []
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        for start in range(0, len(rows), chunk_size):
+            batch = rows[start : start + chunk_size]
+            try:
+                res = await self.session.scalars(stmt, batch)
+            except IntegrityError as e:
+                raise IntegrityRepositoryError(
+                    f"Integrity error in batch {start // chunk_size} "
+                    f"(rows {start}..{start + len(batch) - 1}): {e}"
+                ) from e
+            created.extend(res.all())
+        return created
+
     @execute
     async def update(self, _id: int, data: dict):
+        self._mark_write()
         stmt = (
             update(self.model)
             .where(self.model.id == _id)
@@ -78,22 +437,130 @@ class RepositoryORM(Generic[T]):
 
     @execute
     async def delete(self, _id: int):
+        self._mark_write()
         stmt = delete(self.model).where(self.model.id == _id).returning(self.model)
         res = await self.session.execute(stmt)
-        await self.session.commit()
         return res.scalar_one_or_none()
 
-    async def __find(self, _filter: Filter, filters: dict[str, Any]) -> Select[Tuple]:
-        stmt = select(self.model)
-        f = self._resolve_filter(_filter, filters)
-        stmt = stmt.where(*f)
-        return stmt
+    def _mark_write(self):
+        if self.session.info.get("readonly"):
+            raise ReadOnlyError(
+                f"{self.__class__.__name__}: write through read-only unit of work"
+            )
+        # unit of work комітить лише сесії, в яких був запис
+        self.session.info["writes"] = True
+        self._loader.clear()
+
+    async def _execute(
+        self, stmt: Select, params: dict[str, Any], method: str
+    ) -> Result:
+        diagnostics = self.diagnostics
+        if not diagnostics.sample():
+            return await self.session.execute(stmt, params)
+        start = perf_counter()
+        res = await self.session.execute(stmt, params)
+        elapsed = perf_counter() - start
+        if diagnostics.is_slow(elapsed):
+            # результат AsyncSession уже буферизований — з'єднання вільне для EXPLAIN
+            await diagnostics.capture(
+                self.session,
+                stmt,
+                params,
+                f"{self.__class__.__name__}.{method}",
+                elapsed,
+            )
+        return res
+
+    @classmethod
+    def statement_cache_info(cls) -> dict[str, Any]:
+        return cls._statements.info()
+
+    def __find(
+        self,
+        _filter: Filter,
+        filters: dict[str, Any],
+        **options: Any,
+    ) -> tuple[Select[Tuple], dict[str, Any]]:
+        tree, leaves = self._filter.plan(self._resolve_filter(_filter, filters))
+        shape = self._filter.plan_shape(tree, leaves)
+        if shape is None:
+            # оператор вбудовує значення в SQL — такий запит не кешуємо
+            conditions = self._filter.plan_conditions(tree, leaves, bound=False)
+            return self._select(conditions, **options), {}
+        stmt = self._statements.get(
+            (shape, tuple(sorted(options.items()))),
+            lambda: self._select(
+                self._filter.plan_conditions(tree, leaves), **options
+            ),
+        )
+        return stmt, self._filter.plan_params(leaves)
+
+    def _select(
+        self,
+        conditions: list,
+        page: bool = False,
+        after: bool = False,
+        columns: tuple[str, ...] | None = None,
+        load: tuple[tuple[str, str], ...] = (),
+        total: bool = False,
+        count: bool = False,
+        order: Order = (),
+    ) -> Select[Tuple]:
+        if count:
+            return select(func.count()).select_from(self.model).where(*conditions)
+        if columns is None:
+            stmt = select(self.model).options(*self._loaders(load))
+        else:
+            stmt = select(*(getattr(self.model, name) for name in columns))
+        if total:
+            stmt = stmt.add_columns(func.count().over().label("_total"))
+        stmt = stmt.where(*conditions)
+        if not page:
+            return stmt
+        columns = self._cursor_columns(order)
+        stmt = stmt.order_by(
+            *(col.desc() if desc else col for col, desc in columns)
+        ).limit(bindparam("_limit"))
+        if not after:
+            return stmt.offset(bindparam("_offset"))
+        keys = [
+            bindparam(f"_after_{i}", type_=col.type)
+            for i, (col, _) in enumerate(columns)
+        ]
+        return stmt.where(self._after(columns, keys))
+
+    @staticmethod
+    def _after(columns: list[tuple[Any, bool]], keys: list):
+        """Умова "рядок після курсора" для порядку `columns`."""
+        directions = {desc for _, desc in columns}
+        if len(directions) == 1:
+            # один напрямок: порівняння кортежів, яке Postgres бере з індексу
+            cols = [col for col, _ in columns]
+            left = cols[0] if len(cols) == 1 else tuple_(*cols)
+            right = keys[0] if len(keys) == 1 else tuple_(*keys)
+            return left < right if directions.pop() else left > right
+        # змішані напрямки: (a > :a) OR (a = :a AND b < :b) OR ...
+        steps = []
+        for i, (col, desc) in enumerate(columns):
+            step = col < keys[i] if desc else col > keys[i]
+            equal = [c == k for (c, _), k in zip(columns[:i], keys[:i])]
+            steps.append(and_(*equal, step))
+        return or_(*steps)
 
-    def _resolve_filter(self, _filter: Filter, _filters: dict) -> list[Callable]:
+    def _resolve_filter(
+        self, _filter: Filter | FilterExpr | None, _filters: dict
+    ) -> Filter | FilterExpr:
+        if _filter is None:
+            return Filter().overload(**_filters)
+        if isinstance(_filter, FilterExpr):
+            # іменовані умови додаються до виразу через AND
+            return _filter & Filter().overload(**_filters) if _filters else _filter
         if not isinstance(_filter, Filter):
             raise TypeError(f"_filter must be Filter, not {type(_filter)}")
-        _filter.overload(**_filters)
-        return self._filter.to_conditions(_filter)
+        if _filters:
+            # фільтр викликача не змінюємо — він може бути спільним
+            _filter = _filter.copy().overload(**_filters)
+        return _filter
 
 class EventRepository(RepositoryORM[EventORM]):
     model = EventORM  
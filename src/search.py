@@ -0,0 +1,234 @@
+import re
+
+from sqlalchemy import DDL, Float, String, Table, column, event, func, or_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import literal_column
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import NullType
+
+from src.exceptions import InvalidQueryError
+
+# словник без стемінгу: назви подій змішують мови
+TS_CONFIG = "'simple'"
+_TERM = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> str:
+    """
+    Нормалізує пошуковий рядок до слів через пробіл. Оператори FTS5/tsquery
+    та пунктуація відкидаються, тож ввід користувача не ламає синтаксис.
+    """
+    terms = _TERM.findall(query.lower())
+    if not terms:
+        raise InvalidQueryError(f"Search query '{query}' has no words")
+    return " ".join(terms)
+
+
+class search_document(FunctionElement):
+    """Текстові колонки моделі, по яких іде повнотекстовий пошук."""
+
+    type = String()
+    inherit_cache = True
+
+
+class text_match(FunctionElement):
+    """document MATCH query: GIN/tsvector на Postgres, FTS5 на SQLite."""
+
+    # не Boolean: інакше SQLite дописує "= 1" і умова перестає бути IN-підзапитом
+    type = NullType()
+    inherit_cache = True
+
+
+class text_rank(FunctionElement):
+    """Релевантність рядка до запиту; більше — краще."""
+
+    type = Float()
+    inherit_cache = True
+
+
+def match(document: search_document, query):
+    return text_match(*document.clauses, query)
+
+
+def rank(document: search_document, query):
+    return text_rank(*document.clauses, query)
+
+
+def _split(element):
+    *columns, query = element.clauses
+    return columns, query
+
+
+def _fts_table(columns) -> tuple[str, str]:
+    table = columns[0].table
+    pk = list(table.primary_key.columns)[0]
+    return f"{table.name}_fts", f"{table.name}.{pk.name}"
+
+
+def _concat(columns):
+    # coalesce(title, '') || ' ' || coalesce(description, '')
+    text = None
+    for col in columns:
+        part = func.coalesce(col, literal_column("''"))
+        if text is not None:
+            part = text.op("||")(literal_column("' '")).op("||")(part)
+        text = part
+    return text
+
+
+def _pg_document(columns):
+    # той самий вираз, що й у GIN-індексі, інакше планувальник його не візьме
+    return func.to_tsvector(literal_column(TS_CONFIG), _concat(columns))
+
+
+def _pg_query(query):
+    # "jazz nig" -> 'jazz:* & nig:*' — префіксний пошук по тому ж індексу
+    terms = func.replace(query, literal_column("' '"), literal_column("':* & '"))
+    return func.to_tsquery(literal_column(TS_CONFIG), terms.op("||")(literal_column("':*'")))
+
+
+def _fts_query(query):
+    # "jazz nig" -> 'jazz* nig*' для FTS5
+    terms = func.replace(query, literal_column("' '"), literal_column("'* '"))
+    return terms.op("||")(literal_column("'*'"))
+
+
+@compiles(search_document)
+def _document(element, compiler, **kw):
+    return compiler.process(_concat(list(element.clauses)), **kw)
+
+
+@compiles(search_document, "postgresql")
+def _document_pg(element, compiler, **kw):
+    return compiler.process(_pg_document(list(element.clauses)), **kw)
+
+
+@compiles(text_match)
+def _match(element, compiler, **kw):
+    # без текстового індексу — звичайний LIKE по кожній колонці
+    columns, query = _split(element)
+    expr = None
+    for col in columns:
+        part = col.contains(query)
+        expr = part if expr is None else expr | part
+    return compiler.process(expr, **kw)
+
+
+@compiles(text_match, "postgresql")
+def _match_pg(element, compiler, **kw):
+    columns, query = _split(element)
+    # tsvector для слів і префіксів, trigram (%) для опечаток у назві
+    expr = or_(
+        _pg_document(columns).op("@@", is_comparison=True)(_pg_query(query)),
+        columns[0].op("%", is_comparison=True)(query),
+    )
+    return compiler.process(expr, **kw)
+
+
+@compiles(text_match, "sqlite")
+def _match_sqlite(element, compiler, **kw):
+    columns, query = _split(element)
+    fts, pk = _fts_table(columns)
+    return (
+        f"{pk} IN (SELECT rowid FROM {fts} "
+        f"WHERE {fts} MATCH {compiler.process(_fts_query(query), **kw)})"
+    )
+
+
+@compiles(text_rank)
+def _rank(element, compiler, **kw):
+    return "0.0"
+
+
+@compiles(text_rank, "postgresql")
+def _rank_pg(element, compiler, **kw):
+    columns, query = _split(element)
+    expr = func.ts_rank(_pg_document(columns), _pg_query(query)) + func.similarity(
+        columns[0], query
+    )
+    return compiler.process(expr, **kw)
+
+
+@compiles(text_rank, "sqlite")
+def _rank_sqlite(element, compiler, **kw):
+    columns, query = _split(element)
+    fts, pk = _fts_table(columns)
+    # bm25 тим менший, чим краще збіг, тому знак змінюємо;
+    # збіг у першій колонці (назві) важить більше
+    weights = ", ".join(["10.0"] + ["1.0"] * (len(columns) - 1))
+    return (
+        f"(SELECT -bm25({fts}, {weights}) FROM {fts} "
+        f"WHERE {fts} MATCH {compiler.process(_fts_query(query), **kw)} "
+        f"AND {fts}.rowid = {pk})"
+    )
+
+
+def _pg_index_expression(names: tuple[str, ...]) -> str:
+    expr = _pg_document([column(name) for name in names])
+    return str(
+        expr.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+
+def searchable(model, *names: str):
+    """
+    Додає моделі атрибут `document` для оператора `search` та DDL текстового
+    індексу: tsvector GIN + pg_trgm на Postgres, FTS5 з тригерами на SQLite.
+    Перша колонка (зазвичай назва) також індексується trigram для опечаток.
+    """
+    table: Table = model.__table__
+    name = table.name
+    pk = list(table.primary_key.columns)[0].name
+    fts = f"{name}_fts"
+    cols = ", ".join(names)
+    new = ", ".join(f"new.{n}" for n in names)
+    old = ", ".join(f"old.{n}" for n in names)
+
+    model.document = search_document(*(getattr(model, n) for n in names))
+
+    pg = [
+        DDL(
+            f"CREATE INDEX IF NOT EXISTS ix_{name}_document ON {name} "
+            f"USING gin (({_pg_index_expression(names)}))"
+        ),
+        DDL(
+            f"CREATE INDEX IF NOT EXISTS ix_{name}_{names[0]}_trgm ON {name} "
+            f"USING gin ({names[0]} gin_trgm_ops)"
+        ),
+    ]
+    sqlite = [
+        DDL(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{cols}, content='{name}', content_rowid='{pk}')"
+        ),
+        DDL(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {name} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new}); END"
+        ),
+        DDL(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+            f"VALUES ('delete', old.{pk}, {old}); END"
+        ),
+        DDL(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+            f"VALUES ('delete', old.{pk}, {old}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new}); END"
+        ),
+    ]
+    event.listen(
+        table,
+        "before_create",
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+    )
+    for ddl in pg:
+        event.listen(table, "after_create", ddl.execute_if(dialect="postgresql"))
+    for ddl in sqlite:
+        event.listen(table, "after_create", ddl.execute_if(dialect="sqlite"))
+    event.listen(
+        table,
+        "after_drop",
+        DDL(f"DROP TABLE IF EXISTS {fts}").execute_if(dialect="sqlite"),
+    )
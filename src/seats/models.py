@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Boolean, ForeignKey, Float
+from sqlalchemy import Integer, String, Boolean, ForeignKey, Float, Index
 from src.database import get_base_class 
 from src.mixin_models import CreatedAtMixin 
 from typing import TYPE_CHECKING
@@ -14,6 +14,8 @@ if TYPE_CHECKING:
 
 class SeatsORM(Base, CreatedAtMixin):
     __tablename__ = "seats"
+    # вільні місця події: WHERE event_id = ? AND is_reserved = false
+    __table_args__ = (Index("ix_seats_event_id_is_reserved", "event_id", "is_reserved"),)
     id: Mapped[int] = mapped_column(primary_key=True)
     event_id: Mapped[int] = mapped_column(ForeignKey('events.id'))
     seat_number: Mapped[str] = mapped_column(String, nullable=False)
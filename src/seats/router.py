@@ -2,13 +2,30 @@ from typing import Annotated, List
 
 from fastapi import APIRouter, Depends, status
 
+from src.filter import Filter
 from src.mixin_schemas import Collection, Pagination
+from src.query_filter import QueryFilter
 from src.seats.schemas import SeatCreate, SeatResponse
 from src.seats.service import SeatServiceDep
 
 router = APIRouter(prefix="/seats", tags=["Seats"])
 
 
+class SeatFilter(Filter):
+    seat_row: str
+    seat_number: str
+    price: float
+
+
+SeatQuery = QueryFilter(
+    SeatFilter,
+    reserved=("event_id",),
+    seat_row=("eq", "in"),
+    seat_number=("eq", "in", "starts_with"),
+    price=("gte", "lte", "between"),
+)
+
+
 @router.post(
     "/",
     response_model=SeatResponse,
@@ -19,12 +36,25 @@ async def add_seat(seat_data: SeatCreate, seat_service: SeatServiceDep):
     return await seat_service.add_seat(seat_data)
 
 
+@router.post(
+    "/bulk",
+    response_model=List[SeatResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Add many seats to events in one request (Admin only)",
+)
+async def add_seats(seats_data: List[SeatCreate], seat_service: SeatServiceDep):
+    return await seat_service.add_seats(seats_data)
+
+
 @router.get(
     "/avialable",
     response_model=Collection[SeatResponse],
     summary="Get available seats for an event (Admin only)",
 )
 async def get_available_seats(
-    event_id: int, seat_service: SeatServiceDep, pagin: Pagination = Depends(Pagination)
+    event_id: int,
+    seat_service: SeatServiceDep,
+    pagin: Pagination = Depends(Pagination),
+    filter=Depends(SeatQuery),
 ):
-    return await seat_service.get_available_seats(event_id, pagin)
+    return await seat_service.get_available_seats(event_id, pagin, filter)
@@ -3,7 +3,7 @@ from typing import Annotated, List
 from fastapi import Depends, HTTPException, status
 
 from src.exceptions import EntityNotFoundError, IntegrityRepositoryError
-from src.filter import eq
+from src.filter import Filter, FilterExpr, eq, in_
 from src.interface import IUnitOfWork
 from src.mixin_schemas import Collection, Pagination
 from src.seats.models import SeatsORM
@@ -17,7 +17,7 @@ class SeatService:
 
     async def add_seat(self, seat_date: SeatCreate) -> SeatResponse:
         async with self.uow as work:
-            event = await work.events.find(id=eq(seat_date.event_id))
+            event = await work.events.load(seat_date.event_id)
             if not event:
                 raise EntityNotFoundError(
                     f"Event with id {seat_date.event_id} not found"
@@ -35,24 +35,58 @@ class SeatService:
                     detail="Seat with this row and number already exists for this event.",
                 )
 
+    async def add_seats(self, seats_data: list[SeatCreate]) -> list[SeatResponse]:
+        async with self.uow as work:
+            event_ids = list({seat.event_id for seat in seats_data})
+            events = await work.events.find_all(id=in_(event_ids), limit=len(event_ids))
+            missing = set(event_ids) - {event.id for event in events}
+            if missing:
+                raise EntityNotFoundError(f"Events with ids {sorted(missing)} not found")
+
+            try:
+                new_seats = await work.seats.add_many(
+                    [seat.model_dump() for seat in seats_data]
+                )
+                await work.commit()
+                return [SeatResponse.model_validate(seat) for seat in new_seats]
+            except IntegrityRepositoryError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Seat with this row and number already exists for this event.",
+                )
+
     async def get_available_seats(
-        self, event_id: int, pagin: Pagination
+        self,
+        event_id: int,
+        pagin: Pagination,
+        filter: Filter | FilterExpr | None = None,
     ) -> List[SeatResponse]:
-        async with self.uow as work:
+        async with self.uow.read_only() as work:
             seats = await work.seats.find_all(
-                event_id=eq(event_id), is_reserved=eq(False)
+                filter=filter,
+                event_id=eq(event_id),
+                is_reserved=eq(False),
+                offset=pagin.offset,
+                limit=pagin.limit,
+                after=pagin.after,
+                total=pagin.count,
+                columns=SeatResponse,
             )
             seat_models = [SeatResponse.model_validate(seat) for seat in seats]
             return Collection(
                 offset=pagin.offset,
                 limit=pagin.limit,
+                after=pagin.after,
                 collection=seat_models,
                 size=len(seat_models),
+                next_cursor=seats.next_cursor,
+                count=pagin.count,
+                total=seats.total,
             )
 
     async def reserve_seat(self, seat_id: int, commit: bool = True) -> SeatResponse:
         async with self.uow as work:
-            seat = await work.seats.find(id=eq(seat_id))
+            seat = await work.seats.load(seat_id)
             if not seat:
                 raise EntityNotFoundError(f"Seat with id {seat_id} not found")
             if seat.is_reserved:
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import Select
+
+
+class StatementCache:
+    """LRU-кеш побудованих запитів, ключ — форма запиту, а не значення."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._statements: OrderedDict[Hashable, Select] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, build: Callable[[], Select]) -> Select:
+        with self._lock:
+            stmt = self._statements.get(key)
+            if stmt is not None:
+                self._statements.move_to_end(key)
+                self.hits += 1
+                return stmt
+            self.misses += 1
+        stmt = build()
+        with self._lock:
+            self._statements[key] = stmt
+            self._statements.move_to_end(key)
+            while len(self._statements) > self.maxsize:
+                self._statements.popitem(last=False)
+        return stmt
+
+    def clear(self):
+        with self._lock:
+            self._statements.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._statements),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self._statements)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -12,8 +12,12 @@ if TYPE_CHECKING:
 
 class TicketsORM(Base, CreatedAtMixin):
     __tablename__ = "tickets"
+    # квитки власника, зокрема найновіші першими (?order_by=-created_at)
+    __table_args__ = (Index("ix_tickets_owner_id_created_at", "owner_id", "created_at"),)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
-    event_id: Mapped[int] = mapped_column(ForeignKey("events.id", ondelete="CASCADE"))
+    event_id: Mapped[int] = mapped_column(
+        ForeignKey("events.id", ondelete="CASCADE"), index=True
+    )
     ticket_type: Mapped[str] = mapped_column(default="Standart")
     price: Mapped[int]
     status: Mapped[str] = mapped_column(default="reserved")
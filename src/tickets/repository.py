@@ -4,4 +4,4 @@ from src.tickets.models import TicketsORM
 
 class TicketsRepository(RepositoryORM[TicketsORM]):
     model = TicketsORM
-    pass
+    orderable = ("created_at", "price", "status")
@@ -2,7 +2,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from src.auth.dependencies import AuthUser
+from src.filter import Filter
 from src.mixin_schemas import Collection, Pagination
+from src.query_filter import QueryFilter, QueryOrder
 from src.tickets.schemas import TicketCreate, TicketResponse
 from src.tickets.service import TicketServiceDep
 
@@ -12,6 +14,27 @@ router = APIRouter(
 )
 
 
+class TicketFilter(Filter):
+    event_id: int
+    ticket_type: str
+    status: str
+    is_used: bool
+    price: int
+
+
+TicketQuery = QueryFilter(
+    TicketFilter,
+    event_id=("eq", "in"),
+    ticket_type=("eq", "in"),
+    status=("eq", "in"),
+    is_used=("eq",),
+    price=("gte", "lte", "between"),
+)
+
+# ?order_by=-created_at — найновіші першими
+TicketOrder = QueryOrder("created_at")
+
+
 @router.post(
     "",
     response_model=TicketResponse,
@@ -46,8 +69,8 @@ async def buy_ticket(
     response_model=Collection[TicketResponse],
     summary="Отримати квиток за ID (тільки для власника)"
 )
-async def get_my_ticket(ticket_service: TicketServiceDep, current_user: AuthUser,pagin=Depends(Pagination)):
-    tickets = await ticket_service.get_tickets_by_owner(owner_id=current_user.sub,pagin=pagin)
+async def get_my_ticket(ticket_service: TicketServiceDep, current_user: AuthUser,pagin=Depends(Pagination),filter=Depends(TicketQuery),order_by=Depends(TicketOrder)):
+    tickets = await ticket_service.get_tickets_by_owner(owner_id=current_user.sub,pagin=pagin,filter=filter,order_by=order_by)
     return tickets
 
 @router.get(
@@ -3,7 +3,7 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status
 
 from src.exceptions import EntityNotFoundError, IntegrityRepositoryError
-from src.filter import eq
+from src.filter import Filter, FilterExpr, eq
 from src.interface import IUnitOfWork
 from src.mixin_schemas import Collection, Pagination
 from src.tickets.schemas import TicketCreate, TicketResponse
@@ -16,7 +16,7 @@ class TicketService:
 
     async def create_ticket(self, ticket_data: TicketCreate, owner_id: int) -> TicketResponse:
         async with self.uow as work:
-            event = await work.events.find(id=eq(ticket_data.event_id))
+            event = await work.events.load(ticket_data.event_id)
             if not event:
                 raise EntityNotFoundError(f"Event with id {ticket_data.event_id} not found")
 
@@ -30,15 +30,34 @@ class TicketService:
             except IntegrityRepositoryError:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ticket already exists")
             
-    async def get_tickets_by_owner(self, owner_id: int,pagin:Pagination) -> Collection[TicketResponse]:
-        async with self.uow as work:
-            tickets = await work.tickets.find_all(owner_id=eq(owner_id),offset=pagin.offset,limit=pagin.limit)
+    async def get_tickets_by_owner(self, owner_id: int,pagin:Pagination,filter: Filter | FilterExpr | None = None,order_by: tuple[str, ...] | None = None) -> Collection[TicketResponse]:
+        async with self.uow.read_only() as work:
+            tickets = await work.tickets.find_all(
+                filter=filter,
+                order_by=order_by,
+                require_index=True,
+                owner_id=eq(owner_id),
+                offset=pagin.offset,
+                limit=pagin.limit,
+                after=pagin.after,
+                total=pagin.count,
+                columns=TicketResponse,
+            )
             tickets_models =  [TicketResponse.model_validate(ticket) for ticket in tickets]
-            return Collection(offset=pagin.offset,limit=pagin.limit,collection=tickets_models,size=len(tickets_models))
+            return Collection(
+                offset=pagin.offset,
+                limit=pagin.limit,
+                after=pagin.after,
+                collection=tickets_models,
+                size=len(tickets_models),
+                next_cursor=tickets.next_cursor,
+                count=pagin.count,
+                total=tickets.total,
+            )
         
     async def get_ticket_by_id(self, ticket_id: int) -> TicketResponse:
-        async with self.uow as work:
-            ticket = await work.tickets.find(id=eq(ticket_id))
+        async with self.uow.read_only() as work:
+            ticket = await work.tickets.load(ticket_id)
             if not ticket:
                 return ticket
             return TicketResponse.model_validate(ticket)
@@ -3,9 +3,10 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.auth.repository import RefreshTokenRepository
-from src.database import new_async_session
+from src.database import new_async_session, new_replica_session
 from src.events.repository import EventRepository
 from src.interface import IUnitOfWork
+from src.repository import RepositoryORM
 from src.tickets.repository import TicketsRepository
 from src.users.repository import UserRepository
 from src.seats.repository import SeatsRepository
@@ -14,30 +15,75 @@ log = logging.getLogger(__name__)
 
 
 class SqlAlchemyUnitOfWork(IUnitOfWork):
-    def __init__(self, session_factory: async_sessionmaker):
+    # Репозиторії створюються при першому зверненні до атрибута (див. __getattr__)
+    repositories: dict[str, type[RepositoryORM]] = {
+        "users": UserRepository,
+        "refresh_tokens": RefreshTokenRepository,
+        "events": EventRepository,
+        "tickets": TicketsRepository,
+        "seats": SeatsRepository,
+    }
+    users: UserRepository
+    refresh_tokens: RefreshTokenRepository
+    events: EventRepository
+    tickets: TicketsRepository
+    seats: SeatsRepository
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        readonly_session_factory: async_sessionmaker | None = None,
+        readonly: bool = False,
+    ):
         self.session_factory = session_factory
-        self.users: UserRepository
-        self.refresh_tokens: RefreshTokenRepository
-        self.events: EventRepository
-        self.tickets: TicketsRepository
-        self.seats: SeatsRepository
+        self.readonly_session_factory = readonly_session_factory or session_factory
+        self.readonly = readonly
+        self._active = 0
+
+    def read_only(self) -> "SqlAlchemyUnitOfWork":
+        """
+        Unit of work для читання з репліки. Якщо цей unit of work уже
+        відкритий (йде транзакція запису), читання лишається на основній базі.
+        """
+        if self.readonly or self._active:
+            return self
+        return SqlAlchemyUnitOfWork(self.readonly_session_factory, readonly=True)
 
     async def __aenter__(self):
+        self._active += 1
+        if self._active > 1:
+            # вкладений вхід (спільний uow кількох сервісів) — та сама транзакція
+            return self
+        # AsyncSession бере з'єднання з пулу лише на першому запиті
         self.session: AsyncSession = self.session_factory()
-        self.users = UserRepository(self.session)
-        self.refresh_tokens = RefreshTokenRepository(self.session)
-        self.events = EventRepository(self.session)
-        self.tickets = TicketsRepository(self.session)
-        self.seats = SeatsRepository(self.session)
+        self.session.info["readonly"] = self.readonly
+        for name in self.repositories:
+            self.__dict__.pop(name, None)
         return self
 
+    def __getattr__(self, name: str):
+        repository = self.repositories.get(name)
+        if repository is None or "session" not in self.__dict__:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+        instance = repository(self.session)
+        setattr(self, name, instance)
+        return instance
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._active > 1:
+            self._active -= 1
+            return
         try:
             if exc_type is not None:
                 # Якщо exc_type не є None, це означає, що у блоці 'async with'
                 # виникла помилка. Ми викликаємо ROLLBACK.
                 log.error("Rollback")
                 await self.rollback()
+            elif self.readonly or not self.has_writes():
+                # нічого комітити: close() просто поверне з'єднання в пул
+                pass
             else:
                 # Якщо помилки не було, викликаємо COMMIT.
                 log.info("Commit")
@@ -46,13 +92,24 @@ class SqlAlchemyUnitOfWork(IUnitOfWork):
             # Сесія має бути закрита незалежно від результату
             log.info("Cloce db")
             await self.session.close()
+            self._active -= 1
+
+    def has_writes(self) -> bool:
+        session = self.session
+        return bool(
+            session.info.get("writes")
+            or session.new
+            or session.dirty
+            or session.deleted
+        )
 
     async def commit(self):
         await self.session.commit()
+        self.session.info["writes"] = False
 
     async def rollback(self):
         await self.session.rollback()
 
 
 def get_unit_of_work():
-    return SqlAlchemyUnitOfWork(new_async_session)
+    return SqlAlchemyUnitOfWork(new_async_session, new_replica_session)
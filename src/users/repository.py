@@ -5,7 +5,8 @@ from src.events.models import EventORM
 from src.tickets.models import TicketsORM
 
 class UserRepository(RepositoryORM[UserORM]):
-    model = UserORM 
+    model = UserORM
+    orderable = ("nickname", "email", "is_active", "created_at")
 
 class RefreshTokenRepository(RepositoryORM[RefreshTokenORM]):
     model = RefreshTokenORM 
@@ -1,5 +1,4 @@
 from fastapi import Depends
-from src.filter import eq
 from src.interface import IUnitOfWork
 from src.mixin_schemas import Collection, Pagination
 from src.unit_of_work import get_unit_of_work
@@ -12,8 +11,8 @@ class UserService(IUserService):
         self.uow = uow
 
     async def get(self, _id: int):
-        async with self.uow as work:
-            user = await work.users.find(id=eq(_id))
+        async with self.uow.read_only() as work:
+            user = await work.users.load(_id)
             if user:
                 return UserResponce.model_validate(user)
             return user
@@ -28,14 +27,24 @@ class UserService(IUserService):
             return user
 
     async def get_list(self, pagin: Pagination):
-        async with self.uow as work:
-            users = await work.users.find_all(offset=pagin.offset, limit=pagin.limit)
-            users = list(map(lambda x: UserResponce.model_validate(x), users))
+        async with self.uow.read_only() as work:
+            page = await work.users.find_all(
+                offset=pagin.offset,
+                limit=pagin.limit,
+                after=pagin.after,
+                total=pagin.count,
+                columns=UserResponce,
+            )
+            users = list(map(lambda x: UserResponce.model_validate(x), page))
             return Collection(
                 collection=users,
                 offset=pagin.offset,
                 limit=pagin.limit,
+                after=pagin.after,
                 size=len(users),
+                next_cursor=page.next_cursor,
+                count=pagin.count,
+                total=page.total,
             )
 
 
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+BENCHMARK_RESULTS = pytest.StashKey[list[str]]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        help="запускати тести з міткою benchmark (або RUN_BENCHMARKS=1)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: заміри часу; за замовчуванням пропускаються"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # заміри часу нестабільні на завантажених машинах — лише на вимогу
+    if config.getoption("--benchmark") or os.getenv("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark: --benchmark або RUN_BENCHMARKS=1")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def benchmark_report(request) -> list[str]:
+    """Рядки результатів; друкуються в підсумку pytest, а не зі stdout тесту."""
+    return request.config.stash.setdefault(BENCHMARK_RESULTS, [])
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(BENCHMARK_RESULTS, [])
+    if results:
+        terminalreporter.section("benchmark")
+        for line in results:
+            terminalreporter.write_line(line)
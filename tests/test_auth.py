@@ -0,0 +1,295 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.auth.exceptions import AuthenticationError
+from src.auth.jwt_codec import JWTAuthCodec, JWTKeys
+from src.auth.schemas import ACCESS_TOKEN, REFRESH_TOKEN, TokenCreate, TokenInfo
+from src.auth.service import AuthService
+from src.auth.token_cache import VerifiedTokenCache
+from tests.utils import throughput
+
+
+def pem_pair(algorithm: str = "RS256") -> tuple[str, str]:
+    if algorithm == "ES256":
+        key = ec.generate_private_key(ec.SECP256R1())
+    elif algorithm == "EdDSA":
+        key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return public, private
+
+
+@pytest.fixture(scope="module")
+def codec() -> JWTAuthCodec:
+    public, private = pem_pair()
+    return JWTAuthCodec(public, private, "RS256", expire_minutes=15)
+
+
+@pytest.fixture
+def key_files(tmp_path):
+    public, private = pem_pair()
+    paths = tmp_path / "public.pem", tmp_path / "private.pem"
+    paths[0].write_text(public)
+    paths[1].write_text(private)
+    return paths
+
+
+def rotate(paths, content: tuple[str, str] | None = None):
+    for path, pem in zip(paths, content or pem_pair()):
+        path.write_text(pem)
+        stat = path.stat()
+        # mtime файлової системи може не змінитись за час тесту
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+@pytest.fixture
+def service(codec) -> AuthService:
+    return AuthService(None, codec, token_cache=VerifiedTokenCache(maxsize=2))
+
+
+def token(codec: JWTAuthCodec, type_: str = ACCESS_TOKEN, sub: int = 1, **kw) -> str:
+    payload = TokenCreate(
+        type=type_, sub=sub, username="u", email="u@test.com", is_admin=False
+    )
+    return codec.encode(payload, **kw)
+
+
+def test_verified_token_is_cached(service, codec):
+    access = token(codec)
+
+    first = service.auth(access)
+    second = service.auth(access)
+
+    assert first.sub == 1
+    assert second is first
+    assert service.token_cache.info()["hit_rate"] == 0.5
+
+
+def test_invalid_tokens_are_not_cached(service, codec):
+    access = token(codec)
+    tampered = access[:-4] + ("AAAA" if not access.endswith("AAAA") else "BBBB")
+    expired = token(codec, expire_minutes=-1)
+
+    assert service.auth(tampered) is None
+    assert service.auth(expired) is None
+    with pytest.raises(AuthenticationError):
+        service.auth(token(codec, type_=REFRESH_TOKEN))
+    assert len(service.token_cache) == 0
+
+    # підроблений токен після справжнього все одно перевіряється
+    service.auth(access)
+    assert service.auth(tampered) is None
+
+
+def test_cache_entry_expires_and_is_bounded(monkeypatch):
+    cache = VerifiedTokenCache(maxsize=2)
+    now = datetime.now(timezone.utc)
+    info = TokenInfo(
+        type=ACCESS_TOKEN,
+        sub=1,
+        username="u",
+        email="u@test.com",
+        is_admin=False,
+        iat=now - timedelta(minutes=15),
+        exp=now - timedelta(seconds=1),
+    )
+    cache.put("old", info)
+    assert cache.get("old") is None and len(cache) == 0
+
+    # exp == now: PyJWT такий токен уже відхиляє, кеш теж
+    monkeypatch.setattr(time, "time", lambda: now.timestamp())
+    cache.put("edge", info.model_copy(update={"exp": now}))
+    assert cache.get("edge") is None
+    monkeypatch.undo()
+
+    fresh = info.model_copy(update={"exp": now + timedelta(minutes=5)})
+    for name in ("a", "b", "c"):
+        cache.put(name, fresh)
+    assert len(cache) == 2 and cache.get("a") is None
+
+
+def test_concurrent_auth(service, codec):
+    tokens = [token(codec, sub=i) for i in range(2)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(service.auth, tokens * 50))
+
+    assert [r.sub for r in results] == [0, 1] * 50
+    info = service.token_cache.info()
+    assert info["hits"] + info["misses"] == 100
+    assert info["size"] == 2
+
+
+def test_key_rotation_invalidates_cached_tokens(key_files):
+    cache = VerifiedTokenCache(maxsize=10)
+    keys = JWTKeys("RS256", *key_files, check_interval=1e-9, on_reload=cache.clear)
+    service = AuthService(None, JWTAuthCodec(keys=keys), token_cache=cache)
+    access = token(service.codec)
+    assert service.auth(access).sub == 1 and len(cache) == 1
+
+    rotate(key_files)
+
+    # кешований токен старого ключа не приймається і без промаху кешу
+    assert service.auth(access) is None
+    assert keys.reloads == 1 and len(cache) == 0
+
+
+def test_keys_are_parsed_once(key_files):
+    keys = JWTKeys("RS256", *key_files, check_interval=60)
+    codec = JWTAuthCodec(keys=keys)
+
+    for i in range(5):
+        assert codec.decode(token(codec, sub=i)).sub == i
+
+    assert isinstance(keys.public, rsa.RSAPublicKey)
+    assert keys.metrics()["loads"] == 1 and keys.metrics()["reloads"] == 0
+
+
+def test_keys_reload_on_change(key_files):
+    reloaded = []
+    keys = JWTKeys(
+        "RS256", *key_files, check_interval=1e-9, on_reload=lambda: reloaded.append(1)
+    )
+    codec = JWTAuthCodec(keys=keys)
+    old = token(codec)
+    codec.decode(old)
+
+    rotate(key_files)
+
+    new = token(codec)
+    assert codec.decode(new).sub == 1
+    # kid старого ключа більше не відомий
+    with pytest.raises(jwt.InvalidTokenError, match="Unknown key id"):
+        codec.decode(old)
+    assert keys.reloads == 1 and reloaded == [1]
+
+
+def test_failed_reload_keeps_keys(key_files):
+    keys = JWTKeys("RS256", *key_files, check_interval=0)
+    codec = JWTAuthCodec(keys=keys)
+    issued = token(codec)
+
+    # без check_interval зміни підхоплюються лише за запитом (SIGHUP)
+    rotate(key_files, ("not a key", "not a key"))
+    codec.decode(issued)
+    assert keys.load_errors == 0
+
+    keys.request_reload()
+    assert codec.decode(issued).sub == 1
+    assert keys.load_errors == 1 and keys.reloads == 0
+
+    rotate(key_files)
+    keys.request_reload()
+    keys.refresh()
+    assert keys.reloads == 1
+
+
+def test_encode_reads_one_key_snapshot():
+    pairs = [pem_pair("EdDSA"), pem_pair("EdDSA")]
+
+    class ReloadingKeys(JWTKeys):
+        # перезавантаження з іншого потоку одразу після читання ключа підпису
+        @property
+        def private(self):
+            private = super().private
+            self._set(*pairs[1], ())
+            return private
+
+    keys = ReloadingKeys.from_pem(*pairs[0], "EdDSA")
+    first_kid, first_public = keys.kid, keys.public
+    issued = token(JWTAuthCodec(algorithm="EdDSA", keys=keys))
+
+    # kid і підпис — з однієї пари, навіть якщо ключі замінено посеред encode
+    assert jwt.get_unverified_header(issued)["kid"] == first_kid
+    jwt.decode(issued, first_public, algorithms=["EdDSA"])
+
+
+def test_half_rotated_pair_keeps_keys(key_files):
+    keys = JWTKeys("RS256", *key_files, check_interval=0)
+    codec = JWTAuthCodec(keys=keys)
+    kid = keys.kid
+
+    # новий приватний ключ уже на місці, публічний ще старий
+    rotate(key_files[1:], pem_pair()[1:])
+    keys.request_reload()
+    issued = token(codec)
+
+    assert keys.load_errors == 1 and keys.kid == kid
+    assert codec.decode(issued).sub == 1
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "ES256", "EdDSA"])
+def test_algorithms_sign_with_kid(algorithm):
+    keys = JWTKeys.from_pem(*pem_pair(algorithm), algorithm)
+    codec = JWTAuthCodec(algorithm=algorithm, keys=keys)
+    issued = token(codec)
+
+    header = jwt.get_unverified_header(issued)
+    assert header["alg"] == algorithm and header["kid"] == keys.kid
+    assert codec.decode(issued).sub == 1
+
+
+def test_previous_key_verifies_during_rotation():
+    old_public, old_private = pem_pair("RS256")
+    old = token(JWTAuthCodec(old_public, old_private, "RS256"))
+
+    # новий ключ іншого типу, старий лишається лише для перевірки
+    keys = JWTKeys.from_pem(*pem_pair("EdDSA"), "EdDSA", verify_pems=(old_public,))
+    codec = JWTAuthCodec(algorithm="EdDSA", keys=keys)
+
+    assert codec.decode(old).sub == 1
+    assert codec.decode(token(codec, sub=2)).sub == 2
+    assert len(keys.metrics()["verify_kids"]) == 2
+
+
+def test_unknown_kid_and_legacy_token(codec):
+    other = JWTAuthCodec(*pem_pair(), "RS256")
+    with pytest.raises(jwt.InvalidTokenError, match="Unknown key id"):
+        codec.decode(token(other))
+
+    # токени, видані до появи kid, перевіряються поточним ключем
+    now = datetime.now(timezone.utc)
+    payload = TokenCreate(
+        type=ACCESS_TOKEN, sub=3, username="u", email="u@test.com", is_admin=False
+    ).model_dump(exclude_none=True)
+    payload.update(sub="3", iat=now, exp=now + timedelta(minutes=5))
+    legacy = jwt.encode(payload, codec.keys.private, "RS256")
+    assert codec.decode(legacy).sub == 3
+
+
+def test_header_algorithm_is_ignored():
+    keys = JWTKeys.from_pem(*pem_pair("EdDSA"), "EdDSA")
+    codec = JWTAuthCodec(algorithm="EdDSA", keys=keys)
+    # чужий алгоритм у заголовку з правильним kid не приймається
+    forged = jwt.encode({"sub": "1"}, "s" * 32, "HS256", headers={"kid": keys.kid})
+    with pytest.raises(jwt.InvalidTokenError):
+        codec.decode(forged)
+
+
+@pytest.mark.benchmark
+def test_algorithm_throughput(benchmark_report):
+    """Пропускна здатність encode/decode для кожного алгоритму, токенів/с."""
+    for algorithm in ("RS256", "ES256", "EdDSA"):
+        keys = JWTKeys.from_pem(*pem_pair(algorithm), algorithm)
+        codec = JWTAuthCodec(algorithm=algorithm, keys=keys)
+        issued = token(codec)
+        encode = throughput(lambda: token(codec), number=200)
+        decode = throughput(lambda: codec.decode(issued), number=200)
+        benchmark_report.append(
+            f"JWT {algorithm}: encode {encode:.0f}/s, decode {decode:.0f}/s"
+        )
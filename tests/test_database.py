@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import DbSettings
+from src.database import engine_kwargs
+from src.pool_metrics import InstrumentedAsyncPool, pool_status
+
+
+def test_engine_kwargs_pool_settings():
+    db = DbSettings(url="postgresql+asyncpg://u:p@db/app", pool_size=20, statement_cache_size=0)
+    kwargs = engine_kwargs(db.url, db)
+    assert kwargs["poolclass"] is InstrumentedAsyncPool
+    assert kwargs["pool_size"] == 20
+    assert kwargs["connect_args"] == {"statement_cache_size": 0}
+    assert engine_kwargs("sqlite+aiosqlite:///:memory:", db) == {"echo": False}
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_metrics(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    async with engine.connect() as conn:
+        await conn.execute(text("select 1"))
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+        busy = pool_status(engine.sync_engine.pool)
+    idle = pool_status(engine.sync_engine.pool)
+    await engine.dispose()
+
+    assert busy["checked_out"] == 1
+    assert idle["checkouts"] == 1 and idle["checkins"] == 1
+    assert idle["timeouts"] == 1
+    assert idle["wait_seconds_max"] >= 0
+    # лічильники переживають dispose(), що перестворює пул
+    assert pool_status(engine.sync_engine.pool)["timeouts"] == 1
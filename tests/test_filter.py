@@ -1,8 +1,30 @@
-import pytest
 import logging
+import subprocess
+import types
+from pathlib import Path
+
+import pytest
 from sqlalchemy import Column, Integer, String, Float, Boolean, select
 from sqlalchemy.orm import declarative_base
-from src.filter import Filter, FilterHeadler, Op, eq, neq, gt, lt, gte, lte, like, in_
+from src.filter import (
+    Filter,
+    FilterHeadler,
+    Op,
+    eq,
+    neq,
+    gt,
+    lt,
+    gte,
+    lte,
+    like,
+    in_,
+    between,
+    starts_with,
+    ends_with,
+    contains,
+    len_gt,
+)
+from tests.utils import throughput
 
 Base = declarative_base()
 
@@ -377,6 +399,80 @@ class TestFilterClass:
         assert len(filter_dict) == 1
         assert "name" in filter_dict
 
+    def test_filter_instances_do_not_share_ops(self):
+        """Екземпляри не ділять Op за замовчуванням між собою"""
+        first = UserFilter(age=18)
+        second = UserFilter(age=30)
+
+        assert first.age is not second.age
+        assert first.age.value == 18
+        assert first.age.operator is second.age.operator
+
+    def test_filter_overload_does_not_leak(self):
+        """overload змінює лише свій екземпляр"""
+        f = Filter()
+        f.overload(name=eq("John"))
+
+        assert Filter().to_dict() == {}
+        assert f.copy().to_dict() == f.to_dict()
+        assert f.copy().to_dict() is not f.to_dict()
+
+    def test_filter_unset_fields(self):
+        """Не передані поля не потрапляють в умови"""
+        f = UserFilter(name="John")
+
+        assert f.age is None
+        assert list(f.to_dict()) == ["name"]
+        with pytest.raises(AttributeError):
+            f.unknown
+
+    def test_filter_has_slots(self):
+        """Екземпляри фільтра не мають __dict__"""
+        with pytest.raises(AttributeError):
+            UserFilter(name="John").__dict__
+
+
+# коміт, у якому Filter.__init__ ще викликав get_type_hints на кожен екземпляр
+BASELINE = "4c8e3c7"
+
+
+def baseline_filter_module() -> types.ModuleType:
+    """src/filter.py з BASELINE — справжній «до» для порівняння."""
+    try:
+        source = subprocess.run(
+            ["git", "show", f"{BASELINE}:src/filter.py"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip(f"{BASELINE}:src/filter.py is not in git history")
+    module = types.ModuleType("baseline_filter")
+    exec(compile(source, f"{BASELINE}/src/filter.py", "exec"), module.__dict__)
+    return module
+
+
+@pytest.mark.benchmark
+def test_filter_init_cost(complex_filter_class, benchmark_report):
+    """Мікробенчмарк: вартість Filter(**kwargs) на запит до і після компіляції"""
+    old = baseline_filter_module()
+
+    class BaselineComplexFilter(old.Filter):
+        name: str = old.like()
+        age: int = old.gte()
+        id: int = old.in_()
+        salary: float = old.gt()
+        is_active: bool = old.eq()
+
+    kwargs = dict(name="John", age=25, id=[1], salary=1.0, is_active=True)
+    before = throughput(lambda: BaselineComplexFilter(**kwargs), number=2000)
+    after = throughput(lambda: complex_filter_class(**kwargs), number=2000)
+    benchmark_report.append(
+        f"Filter(**kwargs): {1e6 / before:.1f} us at {BASELINE}, "
+        f"{1e6 / after:.1f} us now"
+    )
+
 
 # ==================== ТЕСТИ ДЛЯ FilterHeadler ====================
 
@@ -514,6 +610,98 @@ class TestFilterHeadler:
         assert conditions[0].right.value == filter_data["name"]
         assert conditions[1].right.value == filter_data["age"]
 
+    @pytest.mark.parametrize(
+        "field,op,params",
+        [
+            ("name", starts_with("Jo"), {"f_name": "Jo%"}),
+            ("name", ends_with("hn"), {"f_name": "%hn"}),
+            ("name", contains("oh"), {"f_name": "%oh%"}),
+            ("age", between((18, 30)), {"f_age_0": 18, "f_age_1": 30}),
+            ("name", len_gt(3), {"f_name": 3}),
+        ],
+    )
+    def test_handler_bound_params(self, filter_handler, field, op, params):
+        """Значення не потрапляють у SQL, а передаються параметрами"""
+        items = filter_handler.resolve(Filter().overload(**{field: op}))
+
+        assert filter_handler.shape(items) is not None
+        condition = filter_handler.to_bound_conditions(items)[0]
+        sql = str(select(UserModel).where(condition))
+        for key in params:
+            assert f":{key}" in sql
+        assert filter_handler.to_params(items) == params
+
+    def test_handler_pattern_shape_does_not_depend_on_value(self, filter_handler):
+        """Різні значення contains дають однаковий ключ форми запиту"""
+        first = filter_handler.resolve(Filter().overload(name=contains("a")))
+        second = filter_handler.resolve(Filter().overload(name=contains("b")))
+
+        assert filter_handler.shape(first) == filter_handler.shape(second)
+
+    def test_handler_caches_column_type(self, filter_handler):
+        """Python тип колонки обчислюється один раз на поле"""
+        filter_handler.to_params(filter_handler.resolve(UserFilter(age=1)))
+        filter_handler.to_params(filter_handler.resolve(UserFilter(age=2)))
+
+        assert filter_handler._types == {"age": int}
+
+
+# ==================== ТЕСТИ ДЛЯ ВИРАЗІВ (&, |, ~) ====================
+
+
+class TestFilterExpr:
+    """Тести для логічних виразів над фільтрами"""
+
+    def sql(self, handler, expr):
+        tree, leaves = handler.plan(expr)
+        stmt = select(UserModel).where(*handler.plan_conditions(tree, leaves))
+        return str(stmt).split("WHERE ")[1], handler.plan_params(leaves)
+
+    def test_or_and_not_grouping(self, filter_handler):
+        """OR всередині AND береться в дужки, NOT застосовується до групи"""
+        active = Filter().overload(is_active=eq(False))
+        expr = (UserFilter(name="Kyiv") | UserFilter(name="Lviv")) & ~active
+
+        where, params = self.sql(filter_handler, expr)
+
+        # SQLAlchemy спрощує NOT (a = b) до a != b
+        assert where == (
+            "(users.name = :f0_name OR users.name = :f1_name) "
+            "AND users.is_active != :f2_is_active"
+        )
+        assert params == {"f0_name": "Kyiv", "f1_name": "Lviv", "f2_is_active": False}
+
+    def test_same_operator_is_flattened(self):
+        """(a | b) | c дає один OR з трьома гілками"""
+        expr = UserFilter(name="a") | UserFilter(name="b") | UserFilter(name="c")
+
+        assert expr.op == "or"
+        assert len(expr.children) == 3
+
+    def test_leaf_with_several_fields_is_grouped(self, filter_handler):
+        """Лист з кількома полями — це AND у дужках всередині OR"""
+        expr = UserFilter(name="a", age=1) | UserFilter(name="b")
+
+        where, _ = self.sql(filter_handler, expr)
+
+        assert where == (
+            "users.name = :f0_name AND users.age > :f0_age OR users.name = :f1_name"
+        )
+
+    def test_shape_does_not_depend_on_values(self, filter_handler):
+        """Однакові вирази з різними значеннями мають один ключ кешу"""
+        first = filter_handler.plan(UserFilter(name="a") | UserFilter(age=1))
+        second = filter_handler.plan(UserFilter(name="b") | UserFilter(age=2))
+        other = filter_handler.plan(UserFilter(name="b") & UserFilter(age=2))
+
+        assert filter_handler.plan_shape(*first) == filter_handler.plan_shape(*second)
+        assert filter_handler.plan_shape(*first) != filter_handler.plan_shape(*other)
+
+    def test_expression_rejects_non_filter(self):
+        """Вираз приймає лише Filter або інші вирази"""
+        with pytest.raises(TypeError):
+            UserFilter(name="a") | eq("b")
+
 
 # ==================== ІНТЕГРАЦІЙНІ ТЕСТИ ====================
 
@@ -0,0 +1,45 @@
+from src.database import Base
+from src.index_advisor import Usage, advise, collect_call_sites, is_covered
+
+
+def test_hot_queries_are_indexed():
+    # новий find/find_all з полем без індексу — додайте індекс у модель
+    missing = advise(collect_call_sites())
+    assert missing == [], "\n".join(
+        f"{a.usage.source}: {a.usage.table}.{a.definition}" for a in missing
+    )
+
+
+def test_call_site_without_index_is_reported(tmp_path):
+    path = tmp_path / "service.py"
+    path.write_text(
+        "async def f(work):\n"
+        "    await work.tickets.find_all(status=eq('paid'), limit=10)\n"
+        "    await work.users.find(email=eq('a@b.c'))\n"
+    )
+    usages = collect_call_sites([path])
+    assert [(u.table, u.columns, u.order) for u in usages] == [
+        ("tickets", ("status",), ("id",)),
+        ("users", ("email",), ()),
+    ]
+
+    [advice] = advise(usages)
+    assert advice.definition == "Index('ix_tickets_status', 'status')"
+    assert advice.ddl == (
+        "CREATE INDEX IF NOT EXISTS ix_tickets_status ON tickets (status)"
+    )
+
+
+def test_index_prefix_and_order_coverage():
+    seats = Base.metadata.tables["seats"]
+    events = Base.metadata.tables["events"]
+
+    def usage(columns, order=()):
+        return Usage("", columns, order, "", True)
+
+    assert is_covered(usage(("is_reserved", "event_id"), ("id",)), seats)
+    assert is_covered(usage(("event_id",)), seats)
+    assert not is_covered(usage(("is_reserved",)), seats)
+    # (start_time, id): індекс по start_time віддає рядки у потрібному порядку
+    assert is_covered(usage((), ("start_time", "id")), events)
+    assert not is_covered(usage(("location",), ("start_time", "id")), events)
@@ -0,0 +1,131 @@
+import pytest
+from sqlalchemy import Boolean, Column, Float, Integer, String, create_engine, event, select
+from sqlalchemy.orm import Session, declarative_base
+
+from src.exceptions import InvalidQueryError
+from src.filter import (
+    Filter,
+    between,
+    contains,
+    ends_with,
+    eq,
+    FilterHeadler,
+    gt,
+    gte,
+    in_,
+    len_gt,
+    like,
+    lt,
+    lte,
+    neq,
+    not_like,
+    search,
+    starts_with,
+)
+from src.memory_filter import column_mask, filter_columns, filter_rows, matches
+
+Base = declarative_base()
+
+
+class ItemModel(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    price = Column(Float)
+    qty = Column(Integer)
+    is_active = Column(Boolean)
+
+
+ROWS = [
+    {"id": 1, "name": "Jazz", "price": 10.0, "qty": 1, "is_active": True},
+    {"id": 2, "name": "jazz", "price": 20.5, "qty": None, "is_active": False},
+    {"id": 3, "name": None, "price": None, "qty": 3, "is_active": None},
+    {"id": 4, "name": "100% rock", "price": 5.0, "qty": 0, "is_active": True},
+    {"id": 5, "name": "a_b", "price": 30.0, "qty": 7, "is_active": False},
+    {"id": 6, "name": "axb", "price": 10.0, "qty": 2, "is_active": True},
+    {"id": 7, "name": "", "price": 0.0, "qty": -1, "is_active": True},
+    {"id": 8, "name": "Блюз", "price": 15.0, "qty": 5, "is_active": None},
+]
+
+
+def where(**ops) -> Filter:
+    return Filter().overload(**ops)
+
+
+@pytest.fixture(scope="module")
+def session():
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def case_sensitive_like(dbapi_connection, _):
+        # SQLite за замовчуванням порівнює LIKE без регістру для ASCII,
+        # Postgres і обчислення в пам'яті — з регістром
+        dbapi_connection.execute("PRAGMA case_sensitive_like = ON")
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(ItemModel(**row) for row in ROWS)
+        session.commit()
+        yield session
+
+
+PARITY = [
+    where(name=eq("jazz")),
+    where(name=eq(None)),
+    where(name=neq("jazz")),
+    where(name=neq(None)),
+    where(price=gt(10.0)),
+    where(price=lt(10.0)),
+    where(price=gte(10.0), qty=lte(2)),
+    where(qty=between((0, 3))),
+    where(qty=in_([1, 3, 5])),
+    where(qty=in_([])),
+    where(name=like("J%")),
+    where(name=like("%з%")),
+    where(name=like("a_b")),
+    where(name=like("100%")),
+    where(name=not_like("%a%")),
+    where(name=starts_with("ja")),
+    where(name=ends_with("b")),
+    where(name=contains("zz")),
+    where(name=len_gt(3)),
+    where(is_active=eq(True)),
+    where(is_active=eq(False)),
+    where(name=contains("a")) | where(qty=eq(None)),
+    where(name=contains("a")) & ~where(is_active=eq(True)),
+    ~where(qty=gt(1)),
+    ~(where(price=gt(10.0)) | where(name=eq("Jazz"))),
+    where(),
+]
+
+
+@pytest.mark.parametrize("expr", PARITY, ids=repr)
+def test_parity_with_sqlite(session, expr):
+    handler = FilterHeadler(ItemModel)
+    conditions = handler.to_conditions(expr)
+    stmt = select(ItemModel.id).where(*conditions).order_by(ItemModel.id)
+    expected = list(session.scalars(stmt))
+
+    assert [row["id"] for row in filter_rows(expr, ROWS)] == expected
+    objects = session.scalars(select(ItemModel).order_by(ItemModel.id)).all()
+    assert [item.id for item in filter_rows(expr, objects)] == expected
+
+    columns = {name: [row[name] for row in ROWS] for name in ROWS[0]}
+    assert filter_columns(expr, columns)["id"] == expected
+
+
+def test_matches_single_row():
+    assert matches(where(name=starts_with("Ja")), ROWS[0])
+    assert not matches(where(name=starts_with("Ja")), ROWS[2])
+
+
+def test_column_mask_checks_input():
+    with pytest.raises(ValueError):
+        column_mask(where(qty=eq(1)), {"qty": [1, 2], "name": ["a"]})
+    with pytest.raises(InvalidQueryError):
+        column_mask(where(qty=eq(1)), {"name": ["a"]})
+
+
+def test_search_is_not_evaluated_in_memory():
+    with pytest.raises(TypeError):
+        filter_rows(where(document=search("jazz")), ROWS)
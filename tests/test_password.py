@@ -0,0 +1,82 @@
+import asyncio
+from time import perf_counter
+
+import pytest
+
+from src.auth.password import (
+    calibrate,
+    hash_password,
+    hash_password_async,
+    measure,
+    verify_password,
+    verify_password_async,
+)
+
+ROUNDS = 10
+LOGINS = 8
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify():
+    hashed = await hash_password_async("secret-password", rounds=4)
+
+    assert hashed.startswith("$2b$04$")
+    assert await verify_password_async("secret-password", hashed)
+    assert not await verify_password_async("wrong-password", hashed)
+
+
+def test_calibrate_picks_cost_under_target(monkeypatch):
+    # кожен +1 до cost подвоює час хеша
+    monkeypatch.setattr(
+        "src.auth.password.measure", lambda rounds, samples=3: 2.0**rounds
+    )
+
+    rounds, timings = calibrate(target_ms=100, max_rounds=10)
+
+    assert rounds == 6
+    assert timings == {4: 16.0, 5: 32.0, 6: 64.0, 7: 128.0}
+
+
+async def max_loop_lag(login, times: int) -> float:
+    """Найбільша затримка event loop, поки йдуть `times` одночасних `login()`, с."""
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        while not done:
+            start = perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, perf_counter() - start - 0.001)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    await asyncio.gather(*(login() for _ in range(times)))
+    done = True
+    await task
+    return lag
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_login_storm_loop_lag(benchmark_report):
+    """Шторм логінів: bcrypt у пулі проти bcrypt в event loop."""
+    hashed = hash_password("secret-password", rounds=ROUNDS)
+    single = measure(ROUNDS, samples=1) / 1000
+
+    async def blocking_login():
+        return verify_password("secret-password", hashed)
+
+    async def offloaded_login():
+        return await verify_password_async("secret-password", hashed)
+
+    blocking = await max_loop_lag(blocking_login, LOGINS)
+    offloaded = await max_loop_lag(offloaded_login, LOGINS)
+    benchmark_report.append(
+        f"login storm x{LOGINS}: max loop lag {blocking * 1000:.1f} ms in loop, "
+        f"{offloaded * 1000:.1f} ms in pool (one hash {single * 1000:.1f} ms)"
+    )
+
+    # у loop кожен хеш зупиняє всі інші запити на весь свій час
+    assert blocking >= single * 0.8
+    assert offloaded < single / 2
@@ -0,0 +1,88 @@
+import logging
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.filter import eq, gt, in_
+from src.query_diagnostics import QueryDiagnostics, explain, param_types
+from src.repository import RepositoryORM
+from src.seed_database import main as drop_table
+from src.unit_of_work import get_unit_of_work
+from src.users.models import UserORM
+
+
+@pytest.fixture
+def diagnostics(monkeypatch):
+    diagnostics = QueryDiagnostics(sample_rate=1.0, threshold_ms=0)
+    monkeypatch.setattr(RepositoryORM, "diagnostics", diagnostics)
+    return diagnostics
+
+
+def test_param_types_hide_values():
+    assert param_types({"f_email": "a@b.c", "f_id": [1, 2], "_limit": 10}) == {
+        "f_email": "str",
+        "f_id": "list[int]",
+        "_limit": "int",
+    }
+
+
+def test_postgres_explain_analyze():
+    stmt = explain(select(UserORM.id).where(UserORM.email == "x"))
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT")
+
+
+def test_postgres_explain_estimate_keeps_bind_params():
+    # count(estimated=True): план без виконання, значення — bind-параметром
+    stmt = explain(select(UserORM.id).where(UserORM.email == "x"), analyze=False)
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "'x'" not in str(compiled) and compiled.params == {"email_1": "x"}
+
+
+@pytest.mark.asyncio
+async def test_slow_find_captures_plan(diagnostics, caplog):
+    async with get_unit_of_work() as work:
+        await drop_table()
+        user = await work.users.add(
+            {"nickname": "slow", "password": "12345678", "email": "slow@test.com"}
+        )
+
+        with caplog.at_level(logging.WARNING, logger="src.query_diagnostics"):
+            found = await work.users.find(email=eq("slow@test.com"))
+            await work.users.find(email=eq("other@test.com"))
+            await work.users.find_all(id=in_([user.id]))
+
+    assert found.id == user.id
+    snapshot = diagnostics.snapshot()
+    assert snapshot["sampled"] == snapshot["slow"] == 3
+
+    first = snapshot["recent"][0]
+    assert first["source"] == "UserRepository.find"
+    assert first["param_types"] == {"f0_email": "str"}
+    assert "slow@test.com" not in str(first)
+    # EXPLAIN QUERY PLAN на SQLite: пошук за унікальним індексом email
+    assert any("email" in step for step in first["plan"])
+
+    # однакова форма запиту — один fingerprint
+    by_source = {s["source"]: s for s in snapshot["fingerprints"]}
+    assert by_source["UserRepository.find"]["count"] == 2
+    assert by_source["UserRepository.find_all"]["count"] == 1
+
+    records = [r.slow_query for r in caplog.records if hasattr(r, "slow_query")]
+    assert len(records) == 3
+
+
+@pytest.mark.asyncio
+async def test_fast_or_unsampled_queries_are_skipped(diagnostics):
+    diagnostics.threshold_ms = 60_000
+    async with get_unit_of_work() as work:
+        await drop_table()
+        await work.users.find_all(id=gt(0))
+        diagnostics.sample_rate = 0
+        await work.users.find_all(id=gt(0))
+
+    snapshot = diagnostics.snapshot()
+    assert snapshot["sampled"] == 1
+    assert snapshot["slow"] == 0 and snapshot["recent"] == []
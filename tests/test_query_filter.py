@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+import pytest
+from starlette.requests import Request
+
+from src.events.router import EventOrder, EventQuery
+from src.exceptions import InvalidQueryError
+from src.filter import Filter, FilterExpr
+from src.seats.router import SeatQuery
+from src.seed_database import main as drop_table
+from src.unit_of_work import get_unit_of_work
+
+
+def request(**params) -> Request:
+    query = urlencode(list(params.items()))
+    return Request({"type": "http", "query_string": query.encode()})
+
+
+def test_parse_operators():
+    f = EventQuery(
+        request(
+            location__in="Kyiv,Lviv",
+            title__contains="jazz",
+            start_time__between="2030-01-01T00:00,2030-01-07T00:00",
+        )
+    )
+
+    assert isinstance(f, Filter)
+    assert f.location.value == ["Kyiv", "Lviv"]
+    assert f.title.value == "jazz"
+    assert f.start_time.value == (datetime(2030, 1, 1), datetime(2030, 1, 7))
+
+
+def test_plain_field_means_eq_and_pagination_is_skipped():
+    f = EventQuery(request(location="Kyiv", limit="5", offset="0"))
+
+    assert list(f.to_dict()) == ["location"]
+    assert EventQuery(request(limit="5")) is None
+
+
+def test_same_field_twice_is_anded():
+    f = EventQuery(
+        request(start_time__gte="2030-01-01T00:00", start_time__lte="2030-01-07T00:00")
+    )
+
+    assert isinstance(f, FilterExpr)
+    assert f.op == "and" and len(f.children) == 2
+
+
+def test_timezone_is_dropped():
+    f = EventQuery(request(start_time__gte="2030-01-01T00:00:00+02:00"))
+
+    assert f.start_time.value.tzinfo is None
+
+
+@pytest.mark.parametrize(
+    "params,message",
+    [
+        ({"owner_id": "1"}, "Unknown filter field"),
+        ({"location__gt": "a"}, "not allowed"),
+        ({"start_time__gte": "tomorrow"}, "Invalid value"),
+        ({"start_time__between": "2030-01-01T00:00"}, "expects 2"),
+    ],
+)
+def test_rejects_invalid_params(params, message):
+    with pytest.raises(InvalidQueryError, match=message):
+        EventQuery(request(**params))
+
+
+def test_reserved_params_of_endpoint():
+    assert SeatQuery(request(event_id="1")) is None
+
+
+@pytest.mark.asyncio
+async def test_query_filter_in_repository():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+        owner = await work.users.add(
+            {"nickname": "owner", "password": "12345678", "email": "owner@test.com"}
+        )
+        start = datetime(2030, 1, 1)
+        for i, location in enumerate(["Kyiv", "Lviv", "Odesa", "Kyiv"]):
+            await work.events.add(
+                {
+                    "owner_id": owner.id,
+                    "title": f"jazz night {i}" if i % 2 else f"rock {i}",
+                    "location": location,
+                    "start_time": start + timedelta(days=i),
+                    "end_time": start + timedelta(days=i, hours=2),
+                }
+            )
+
+        f = EventQuery(
+            request(
+                location__in="Kyiv,Lviv",
+                start_time__gte="2030-01-02T00:00",
+                title__contains="jazz",
+            )
+        )
+        events = await work.events.find_all(filter=f)
+
+        assert [(e.title, e.location) for e in events] == [
+            ("jazz night 1", "Lviv"),
+            ("jazz night 3", "Kyiv"),
+        ]
+
+
+def test_query_order_whitelist():
+    assert EventOrder(order_by="-start_time") == ("-start_time",)
+    assert EventOrder(order_by=None) is None
+    with pytest.raises(InvalidQueryError):
+        EventOrder(order_by="title")
+    # order_by не є полем фільтра
+    assert EventQuery(request(order_by="-start_time")) is None
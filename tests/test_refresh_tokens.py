@@ -0,0 +1,239 @@
+import os
+from time import perf_counter
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Integer,
+    LargeBinary,
+    MetaData,
+    Table,
+    Text,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.auth import migrate_refresh_tokens
+from src.auth.migrate_refresh_tokens import DIGEST_INDEX, OLD_INDEX, migrate
+from src.auth.models import RefreshTokenORM
+from src.auth.utils import token_digest
+from src.database import Base
+from src.load_models import load_all_orm_models
+from src.query_diagnostics import explain
+
+# той самий запит, що й work.refresh_tokens.find(token_digest=eq(...))
+refresh_tokens = RefreshTokenORM.__table__
+LOOKUP = select(refresh_tokens).where(
+    refresh_tokens.c.token_digest == token_digest("t")
+)
+
+OLD_SCHEMA = """
+CREATE TABLE refresh_tokens (
+    id INTEGER PRIMARY KEY,
+    token VARCHAR NOT NULL,
+    user_id INTEGER,
+    revoked BOOLEAN DEFAULT 0,
+    created_at DATETIME
+)
+"""
+
+
+@pytest.mark.asyncio
+async def test_migrate_existing_tokens(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    async with engine.begin() as conn:
+        await conn.execute(text(OLD_SCHEMA))
+        await conn.execute(
+            text("CREATE INDEX ix_refresh_tokens_token ON refresh_tokens (token)")
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO refresh_tokens (token, user_id, revoked) "
+                "VALUES (:t, 1, :r)"
+            ),
+            [
+                {"t": "a", "r": False},
+                {"t": "b", "r": False},
+                {"t": "dup", "r": False},
+                {"t": "dup", "r": True},
+                {"t": "c", "r": False},
+            ],
+        )
+
+    stats = await migrate(engine, batch_size=2)
+    assert stats == {"column_added": 1, "filled": 5, "merged": 1}
+
+    async with engine.connect() as conn:
+        rows = (
+            await conn.execute(
+                text(
+                    "SELECT id, token, token_digest, revoked "
+                    "FROM refresh_tokens ORDER BY id"
+                )
+            )
+        ).all()
+        indexes = await conn.run_sync(
+            lambda sync: inspect(sync).get_indexes("refresh_tokens")
+        )
+
+    assert [(r.token, bytes(r.token_digest)) for r in rows] == [
+        (t, token_digest(t)) for t in ("a", "b", "dup", "c")
+    ]
+    # відкликана копія відкликає токен, що лишився
+    assert rows[2].id == 3 and rows[2].revoked
+    assert [(i["name"], bool(i["unique"])) for i in indexes] == [(DIGEST_INDEX, True)]
+
+    async with engine.connect() as conn:
+        plan = " ".join(row.detail for row in await conn.execute(explain(LOOKUP)))
+    assert f"USING INDEX {DIGEST_INDEX}" in plan
+
+    # повторний запуск нічого не змінює
+    assert await migrate(engine) == {"column_added": 0, "filled": 0, "merged": 0}
+    await engine.dispose()
+
+
+async def old_table(tmp_path, tokens: list[str]):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    async with engine.begin() as conn:
+        await conn.execute(text(OLD_SCHEMA))
+        await conn.execute(text(f"CREATE INDEX {OLD_INDEX} ON refresh_tokens (token)"))
+        await conn.execute(
+            text("INSERT INTO refresh_tokens (token, user_id) VALUES (:t, 1)"),
+            [{"t": t} for t in tokens],
+        )
+    return engine
+
+
+async def index_names(engine) -> list[str]:
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(
+            lambda sync: inspect(sync).get_indexes("refresh_tokens")
+        )
+    return sorted(i["name"] for i in indexes)
+
+
+@pytest.mark.asyncio
+async def test_invalid_index_is_rebuilt(tmp_path, monkeypatch):
+    engine = await old_table(tmp_path, ["a", "b"])
+    await migrate(engine)
+
+    # як після невдалого CREATE INDEX CONCURRENTLY у PostgreSQL
+    check = migrate_refresh_tokens.digest_index_valid
+    calls = []
+
+    async def invalid_once(conn):
+        calls.append(conn)
+        return False if len(calls) == 1 else await check(conn)
+
+    monkeypatch.setattr(migrate_refresh_tokens, "digest_index_valid", invalid_once)
+    async with engine.begin() as conn:
+        # дублікат, що з'явився після злиття попереднього запуску
+        await conn.execute(text(f"DROP INDEX {DIGEST_INDEX}"))
+        await conn.execute(text(f"CREATE INDEX {DIGEST_INDEX} ON refresh_tokens (id)"))
+        await conn.execute(
+            text(
+                "INSERT INTO refresh_tokens (token, token_digest, user_id) "
+                "VALUES ('a', :d, 1)"
+            ),
+            {"d": token_digest("a")},
+        )
+
+    assert (await migrate(engine))["merged"] == 1
+    assert await index_names(engine) == [DIGEST_INDEX]
+    async with engine.connect() as conn:
+        plan = " ".join(row.detail for row in await conn.execute(explain(LOOKUP)))
+    assert f"USING INDEX {DIGEST_INDEX}" in plan
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_old_index_is_kept_without_valid_digest_index(tmp_path, monkeypatch):
+    engine = await old_table(tmp_path, ["a"])
+
+    async def never_valid(conn):
+        return None
+
+    monkeypatch.setattr(migrate_refresh_tokens, "digest_index_valid", never_valid)
+    with pytest.raises(RuntimeError, match="not valid"):
+        await migrate(engine)
+    assert OLD_INDEX in await index_names(engine)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_lookup_uses_digest_index(tmp_path):
+    load_all_orm_models()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'new.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        plan = " ".join(row.detail for row in await conn.execute(explain(LOOKUP)))
+    await engine.dispose()
+
+    assert f"SEARCH refresh_tokens USING INDEX {DIGEST_INDEX}" in plan
+
+
+ROWS = int(os.getenv("REFRESH_TOKEN_BENCHMARK_ROWS", 20_000))
+
+
+def jwt_like(i: int) -> str:
+    # довжина як у справжнього refresh-токена
+    return f"eyJhbGciOiJSUzI1NiJ9.{'x' * 380}.{i:012d}"
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_lookup_latency(tmp_path, benchmark_report):
+    """
+    Пошук refresh-токена: JWT-рядок без індексу проти token_digest з
+    унікальним індексом. Повний масштаб (10M рядків, PostgreSQL):
+
+        REFRESH_TOKEN_BENCHMARK_ROWS=10000000 \\
+        BENCHMARK_DATABASE_URI=postgresql+asyncpg://... \\
+        pytest tests/test_refresh_tokens.py --benchmark
+    """
+    default = f"sqlite+aiosqlite:///{tmp_path / 'bench.db'}"
+    engine = create_async_engine(os.getenv("BENCHMARK_DATABASE_URI", default))
+    table = Table(
+        "refresh_tokens_benchmark",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("token", Text, nullable=False),
+        Column("token_digest", LargeBinary(32), nullable=False, unique=True),
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop, checkfirst=True)
+        await conn.run_sync(table.create)
+    for start in range(0, ROWS, 10_000):
+        async with engine.begin() as conn:
+            tokens = map(jwt_like, range(start, min(start + 10_000, ROWS)))
+            await conn.execute(
+                insert(table),
+                [{"token": t, "token_digest": token_digest(t)} for t in tokens],
+            )
+
+    # токени з кінця таблиці: найгірший випадок для повного сканування
+    wanted = [jwt_like(ROWS - 1 - i) for i in range(20)]
+    by_token = select(table.c.id).where(table.c.token == text(":value"))
+    by_digest = select(table.c.id).where(table.c.token_digest == text(":value"))
+
+    async def latency(stmt, values) -> float:
+        async with engine.connect() as conn:
+            start = perf_counter()
+            for value in values:
+                found = await conn.execute(stmt, {"value": value})
+                assert found.scalar() is not None
+            return (perf_counter() - start) / len(values) * 1000
+
+    full_scan = await latency(by_token, wanted)
+    indexed = await latency(by_digest, [token_digest(t) for t in wanted])
+    benchmark_report.append(
+        f"refresh token lookup, {ROWS} rows: "
+        f"token {full_scan:.3f} ms, token_digest {indexed:.3f} ms"
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop)
+    await engine.dispose()
@@ -1,8 +1,19 @@
+import asyncio
+from datetime import datetime, timedelta
+
 import pytest
+from sqlalchemy import select
 
-from src.filter import eq
+from src.dataloader import DataLoader
+from src.events.repository import EventRepository
+from src.exceptions import IntegrityRepositoryError, InvalidQueryError
+from src.filter import Filter, eq, in_
 from src.seed_database import main as drop_table
+from src.statement_cache import StatementCache
 from src.unit_of_work import get_unit_of_work
+from src.users.models import UserORM
+from src.users.schemas import UserResponce
+from tests.utils import assert_num_queries
 
 
 @pytest.mark.asyncio
@@ -13,8 +24,11 @@ async def test_repository():
 
         # Додаємо запис
         data = {"nickname": "test", "password": "12345678", "email": "test@test.com"}
-        instance = await work.users.add(data)
+        with assert_num_queries(1):
+            instance = await work.users.add(data)
         assert instance.nickname == "test"
+        # server defaults приходять з RETURNING без окремого SELECT
+        assert instance.created_at is not None and instance.is_active is True
 
         # Знаходимо запис
         found = await work.users.find(nickname=eq("test"))
@@ -31,3 +45,384 @@ async def test_repository():
         # Перевіряємо find_all
         all_items = await work.users.find_all(limit=10)
         assert len(all_items) == 0  # після видалення
+
+
+@pytest.mark.asyncio
+async def test_find_all_cursor_pagination():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+
+        for i in range(5):
+            await work.users.add(
+                {"nickname": f"user{i}", "password": "12345678", "email": f"u{i}@test.com"}
+            )
+
+        first = await work.users.find_all(limit=2)
+        assert [u.nickname for u in first] == ["user0", "user1"]
+        assert first.next_cursor is not None
+
+        second = await work.users.find_all(limit=2, after=first.next_cursor)
+        assert [u.nickname for u in second] == ["user2", "user3"]
+
+        # offset ігнорується в курсорному режимі
+        third = await work.users.find_all(limit=2, offset=100, after=second.next_cursor)
+        assert [u.nickname for u in third] == ["user4"]
+        assert third.next_cursor is None
+
+        with pytest.raises(InvalidQueryError):
+            await work.users.find_all(limit=2, after="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_add_many():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+
+        rows = [
+            {"nickname": f"bulk{i}", "password": "12345678", "email": f"b{i}@test.com"}
+            for i in range(7)
+        ]
+        created = await work.users.add_many(rows, chunk_size=3)
+        assert [u.nickname for u in created] == [r["nickname"] for r in rows]
+        assert all(u.id is not None and u.created_at is not None for u in created)
+
+        with pytest.raises(IntegrityRepositoryError, match="batch 1"):
+            await work.users.add_many(
+                [
+                    {"nickname": "new", "password": "12345678", "email": "new@test.com"},
+                    {"nickname": "dup", "password": "12345678", "email": "b0@test.com"},
+                ],
+                chunk_size=1,
+            )
+
+
+@pytest.mark.asyncio
+async def test_find_all_with_filter_expression():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+        for i in range(4):
+            await work.users.add(
+                {"nickname": f"or{i}", "password": "12345678", "email": f"or{i}@test.com"}
+            )
+
+        def by_email(i):
+            return Filter().overload(email=eq(f"or{i}@test.com"))
+
+        before = work.users.statement_cache_info()
+        first = await work.users.find_all(filter=by_email(0) | by_email(1))
+        second = await work.users.find_all(
+            filter=(by_email(2) | by_email(3)) & ~by_email(3)
+        )
+        third = await work.users.find_all(filter=by_email(2) | by_email(3))
+        after = work.users.statement_cache_info()
+
+        assert [u.nickname for u in first] == ["or0", "or1"]
+        assert [u.nickname for u in second] == ["or2"]
+        assert [u.nickname for u in third] == ["or2", "or3"]
+        # перший і третій вирази мають однакову форму
+        assert after["hits"] - before["hits"] == 1
+        assert after["misses"] - before["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_reuses_query_shape():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+        for i in range(3):
+            await work.users.add(
+                {"nickname": f"c{i}", "password": "12345678", "email": f"c{i}@test.com"}
+            )
+
+        before = work.users.statement_cache_info()
+        first = await work.users.find(email=eq("c0@test.com"))
+        second = await work.users.find(email=eq("c2@test.com"))
+        after = work.users.statement_cache_info()
+
+        assert (first.nickname, second.nickname) == ("c0", "c2")
+        assert after["hits"] - before["hits"] >= 1
+        # кеш належить класу репозиторію, а не сесії
+        assert type(work.users)._statements is not type(work.events)._statements
+        users = work.users.statement_cache_info()
+        events = work.events.statement_cache_info()
+        await work.users.find(nickname=eq("c1"))
+        after = work.users.statement_cache_info()
+        assert after["hits"] + after["misses"] == users["hits"] + users["misses"] + 1
+        assert work.events.statement_cache_info() == events
+
+
+def test_statement_cache_lru_eviction():
+    cache = StatementCache(maxsize=2)
+    cache.get("a", lambda: select(UserORM))
+    cache.get("b", lambda: select(UserORM))
+    cache.get("a", lambda: pytest.fail("must be cached"))
+    cache.get("c", lambda: select(UserORM))
+
+    assert len(cache) == 2
+    assert cache.info()["hits"] == 1
+    rebuilt = []
+    cache.get("b", lambda: rebuilt.append(1) or select(UserORM))
+    assert rebuilt == [1]
+
+
+@pytest.mark.asyncio
+async def test_find_all_projection():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+        for i in range(3):
+            await work.users.add(
+                {"nickname": f"proj{i}", "password": "12345678", "email": f"p{i}@test.com"}
+            )
+
+        rows = await work.users.find_all(limit=2, columns=UserResponce)
+        assert [r.nickname for r in rows] == ["proj0", "proj1"]
+        assert not hasattr(rows[0], "password")
+        assert UserResponce.model_validate(rows[0]).email == "p0@test.com"
+        assert rows.next_cursor is not None
+
+        emails = await work.users.find_all(limit=10, columns=["email"])
+        assert [r.email for r in emails] == ["p0@test.com", "p1@test.com", "p2@test.com"]
+
+        with pytest.raises(InvalidQueryError):
+            await work.users.find_all(columns=["no_such_column"])
+
+
+@pytest.mark.asyncio
+async def test_find_all_eager_load_relationships():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+        owner = await work.users.add(
+            {"nickname": "owner", "password": "12345678", "email": "owner@test.com"}
+        )
+        start = datetime(2030, 1, 1)
+        for i in range(3):
+            event = await work.events.add(
+                {
+                    "owner_id": owner.id,
+                    "title": f"event{i}",
+                    "location": "Kyiv",
+                    "start_time": start + timedelta(days=i),
+                    "end_time": start + timedelta(days=i, hours=2),
+                }
+            )
+            for _ in range(2):
+                await work.tickets.add(
+                    {"owner_id": owner.id, "event_id": event.id, "price": 100}
+                )
+        work.session.expunge_all()
+
+        # одна вибірка подій + один SELECT ... IN для всіх квитків
+        with assert_num_queries(2):
+            events = await work.events.find_all(load=["tickets"])
+            assert [len(e.tickets) for e in events] == [2, 2, 2]
+
+        work.session.expunge_all()
+        with assert_num_queries(1):
+            event = await work.events.find(id=eq(events[0].id), load={"owner": "joined"})
+            assert event.owner.nickname == "owner"
+
+        with pytest.raises(InvalidQueryError):
+            await work.events.find_all(load=["no_such_relationship"])
+
+
+@pytest.mark.asyncio
+async def test_find_all_total():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+        for i in range(5):
+            await work.users.add(
+                {"nickname": f"total{i}", "password": "12345678", "email": f"t{i}@test.com"}
+            )
+
+        page = await work.users.find_all(limit=2, total="exact")
+        assert len(page) == 2 and page.total == 5
+
+        projected = await work.users.find_all(limit=2, columns=["email"], total="exact")
+        assert projected.total == 5
+
+        # курсорна сторінка рахує весь фільтр, а не лише рядки після курсора
+        next_page = await work.users.find_all(limit=2, after=page.next_cursor, total="exact")
+        assert next_page.total == 5
+
+        # сторінка за межами даних: вікна немає, спрацьовує окремий COUNT
+        empty = await work.users.find_all(limit=2, offset=10, total="exact")
+        assert list(empty) == [] and empty.total == 5
+
+        # на SQLite оцінка падає назад на точний підрахунок
+        estimated = await work.users.find_all(limit=2, total="estimated")
+        assert estimated.total == 5
+
+        assert await work.users.count(email=in_(["t0@test.com", "t1@test.com"])) == 2
+        assert (await work.users.find_all(limit=2)).total is None
+
+
+@pytest.mark.asyncio
+async def test_load_batches_and_memoizes():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+        ids = []
+        for i in range(3):
+            user = await work.users.add(
+                {"nickname": f"dl{i}", "password": "12345678", "email": f"dl{i}@test.com"}
+            )
+            ids.append(user.id)
+        work.session.expunge_all()
+        work.users._loader.clear()
+
+        # три різні id і дублікат одного проходу event loop — один SELECT ... IN
+        with assert_num_queries(1):
+            users = await asyncio.gather(*(work.users.load(i) for i in ids + [ids[0]]))
+        assert [u.nickname for u in users] == ["dl0", "dl1", "dl2", "dl0"]
+
+        with assert_num_queries(0):
+            assert (await work.users.load(ids[1])).nickname == "dl1"
+
+        # щойно доданий рядок уже в кеші
+        new = await work.users.add(
+            {"nickname": "dl3", "password": "12345678", "email": "dl3@test.com"}
+        )
+        with assert_num_queries(0):
+            assert await work.users.load(new.id) is new
+
+        # запис скидає кеш
+        await work.users.update(_id=ids[0], data={"nickname": "dl0x"})
+        with assert_num_queries(1):
+            assert (await work.users.load(ids[0])).nickname == "dl0x"
+        assert await work.users.load(10**6) is None
+
+
+@pytest.mark.asyncio
+async def test_dataloader_does_not_memoize_errors():
+    calls = []
+
+    async def batch(keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return {key: key * 10 for key in keys}
+
+    loader = DataLoader(batch)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    assert await loader.load(1) == 10
+    assert calls == [[1], [1]]
+
+
+@pytest.mark.asyncio
+async def test_dataloader_cancelled_waiter_does_not_cancel_others():
+    calls = []
+    release = asyncio.Event()
+
+    async def batch(keys):
+        calls.append(keys)
+        await release.wait()
+        return {key: key * 10 for key in keys}
+
+    loader = DataLoader(batch)
+    dropped = asyncio.ensure_future(loader.load(1))
+    kept = asyncio.ensure_future(loader.load(1))
+    await asyncio.sleep(0)
+    dropped.cancel()
+    release.set()
+
+    assert await kept == 10
+    assert dropped.cancelled()
+    assert await loader.load(1) == 10
+    assert calls == [[1]]
+
+
+@pytest.mark.asyncio
+async def test_dataloader_forgets_cancelled_batch():
+    calls = []
+
+    async def batch(keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            raise asyncio.CancelledError
+        return {key: key * 10 for key in keys}
+
+    loader = DataLoader(batch)
+    with pytest.raises(asyncio.CancelledError):
+        await loader.load(1)
+    assert await loader.load(1) == 10
+    assert calls == [[1], [1]]
+
+
+@pytest.mark.asyncio
+async def test_find_all_order_by_mixed_directions():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+        names = ["b", "e", "a", "f", "c", "d"]
+        for i, name in enumerate(names):
+            await work.users.add(
+                {
+                    "nickname": name,
+                    "password": "12345678",
+                    "email": f"{name}@test.com",
+                    "is_active": i % 2 == 0,
+                }
+            )
+
+        seen, after = [], None
+        while True:
+            page = await work.users.find_all(
+                limit=2, after=after, order_by=("is_active", "-nickname")
+            )
+            seen += [u.nickname for u in page]
+            if page.next_cursor is None:
+                break
+            after = page.next_cursor
+
+        # неактивні (e, f, d) першими, в межах групи — за спаданням імені
+        assert seen == ["f", "e", "d", "c", "b", "a"]
+
+        newest = await work.users.find_all(limit=3, order_by="-id", columns=["nickname"])
+        assert [u.nickname for u in newest] == ["d", "c", "f"]
+
+        # лише білий список orderable: порядок за паролем розкривав би хеші
+        with pytest.raises(InvalidQueryError, match="can`t be ordered"):
+            await work.users.find_all(order_by="password")
+        with pytest.raises(InvalidQueryError, match="can`t be ordered"):
+            await work.refresh_tokens.find_all(order_by="token")
+
+
+def test_orderable_rejects_nullable_columns():
+    # keyset-курсор по колонці з NULL мовчки пропускав би рядки
+    with pytest.raises(ValueError, match="description"):
+
+        class DescriptionOrder(EventRepository):
+            orderable = ("description",)
+
+
+@pytest.mark.asyncio
+async def test_find_all_require_index():
+    uow = get_unit_of_work()
+    async with uow as work:
+        await drop_table()
+
+        await work.events.find_all(order_by="-start_time", require_index=True)
+        await work.events.find_all(
+            order_by="start_time", require_index=True, location=eq("Kyiv")
+        )
+        # (owner_id, created_at): власник фіксований — індекс дає порядок
+        await work.tickets.find_all(
+            order_by="-created_at", require_index=True, owner_id=eq(1)
+        )
+        await work.users.find_all(order_by="-email", require_index=True)
+
+        with pytest.raises(InvalidQueryError, match="No index"):
+            await work.tickets.find_all(order_by="-created_at", require_index=True)
+        with pytest.raises(InvalidQueryError, match="No index"):
+            await work.users.find_all(order_by="nickname", require_index=True)
+        with pytest.raises(InvalidQueryError, match="No index"):
+            await work.events.find_all(
+                order_by=("start_time", "-title"), require_index=True
+            )
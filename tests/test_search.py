@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.events.models import EventORM
+from src.exceptions import InvalidQueryError
+from src.filter import eq, search
+from src.search import _pg_index_expression, match, search_terms
+from src.seed_database import main as drop_table
+from src.unit_of_work import get_unit_of_work
+
+EVENTS = [
+    ("Jazz night", "Live jazz and blues"),
+    ("Rock concert", "Loud guitars"),
+    ("Jazz brunch", None),
+    ("Poetry evening", "Readings with a jazz trio"),
+    ("Opera", "Classical night"),
+]
+
+
+async def seed(work):
+    await drop_table()
+    owner = await work.users.add(
+        {"nickname": "owner", "password": "12345678", "email": "owner@test.com"}
+    )
+    start = datetime(2030, 1, 1)
+    events = []
+    for i, (title, description) in enumerate(EVENTS):
+        events.append(
+            await work.events.add(
+                {
+                    "owner_id": owner.id,
+                    "title": title,
+                    "description": description,
+                    "location": "Kyiv" if i % 2 else "Lviv",
+                    "start_time": start + timedelta(days=i),
+                    "end_time": start + timedelta(days=i, hours=2),
+                }
+            )
+        )
+    return events
+
+
+def test_search_terms_strips_syntax():
+    assert search_terms('Jazz AND "night" -rock*') == "jazz and night rock"
+    with pytest.raises(InvalidQueryError):
+        search_terms("  *** ")
+
+
+def test_postgres_query_matches_index_expression():
+    # GIN-індекс спрацює, лише якщо вираз у WHERE той самий, що в індексі
+    stmt = select(EventORM.id).where(match(EventORM.document, "jazz"))
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    index = _pg_index_expression(("title", "description"))
+
+    assert index.replace("title", "events.title").replace(
+        "description", "events.description"
+    ) in sql
+    assert "to_tsquery" in sql
+
+
+@pytest.mark.asyncio
+async def test_search_ranked_and_paginated():
+    async with get_unit_of_work() as work:
+        await seed(work)
+
+        first = await work.events.search("jazz", limit=2)
+        second = await work.events.search("jazz", limit=2, after=first.next_cursor)
+
+        titles = [e.title for e in first] + [e.title for e in second]
+        assert sorted(titles) == ["Jazz brunch", "Jazz night", "Poetry evening"]
+        # збіг у назві важить більше, ніж лише в описі
+        assert titles[-1] == "Poetry evening"
+        assert second.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_search_prefix_filter_and_projection():
+    async with get_unit_of_work() as work:
+        await seed(work)
+
+        found = await work.events.search("ja", location=eq("Lviv"), columns=["title"])
+        assert sorted(row.title for row in found) == ["Jazz brunch", "Jazz night"]
+
+        found = await work.events.find_all(document=search("night"))
+        assert sorted(e.title for e in found) == ["Jazz night", "Opera"]
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_updates():
+    async with get_unit_of_work() as work:
+        events = await seed(work)
+
+        await work.events.update(_id=events[1].id, data={"title": "Jazz rock"})
+        await work.events.delete(_id=events[0].id)
+
+        found = await work.events.search("jazz")
+        assert "Jazz night" not in [e.title for e in found]
+        assert "Jazz rock" in [e.title for e in found]
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_bad_input():
+    async with get_unit_of_work() as work:
+        await seed(work)
+        with pytest.raises(InvalidQueryError):
+            await work.events.search("!!!")
+        with pytest.raises(InvalidQueryError):
+            await work.users.search("owner")
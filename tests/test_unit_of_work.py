@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.database import Base, RoundRobinSessionFactory
+from src.exceptions import ReadOnlyError
+from src.filter import eq
+from src.unit_of_work import SqlAlchemyUnitOfWork
+
+
+async def make_db(path, nickname: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    uow = SqlAlchemyUnitOfWork(factory)
+    async with uow as work:
+        await work.users.add(
+            {"nickname": nickname, "password": "12345678", "email": "db@test.com"}
+        )
+        await work.commit()
+    return engine, factory
+
+
+@pytest.mark.asyncio
+async def test_readonly_unit_of_work_routes_to_replicas(tmp_path):
+    primary, primary_factory = await make_db(tmp_path / "primary.db", "primary")
+    replica1, replica1_factory = await make_db(tmp_path / "replica1.db", "replica1")
+    replica2, replica2_factory = await make_db(tmp_path / "replica2.db", "replica2")
+    uow = SqlAlchemyUnitOfWork(
+        primary_factory, RoundRobinSessionFactory([replica1_factory, replica2_factory])
+    )
+
+    seen = []
+    for _ in range(4):
+        async with uow.read_only() as work:
+            user = await work.users.find(email=eq("db@test.com"))
+            seen.append(user.nickname)
+    assert seen == ["replica1", "replica2", "replica1", "replica2"]
+
+    async with uow as work:
+        # читання всередині транзакції запису лишається на основній базі
+        async with work.read_only() as read:
+            user = await read.users.find(email=eq("db@test.com"))
+        assert user.nickname == "primary"
+
+    async with uow.read_only() as work:
+        with pytest.raises(ReadOnlyError):
+            await work.users.add(
+                {"nickname": "nope", "password": "12345678", "email": "x@test.com"}
+            )
+
+    for engine in (primary, replica1, replica2):
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_repositories_are_lazy_and_reads_skip_commit(tmp_path):
+    engine, factory = await make_db(tmp_path / "lazy.db", "lazy")
+    uow = SqlAlchemyUnitOfWork(factory)
+    commits = []
+
+    async def commit():
+        commits.append(1)
+
+    uow.commit = commit
+
+    async with uow as work:
+        assert "users" not in work.__dict__
+        user = await work.users.find(email=eq("db@test.com"))
+        assert work.users is work.__dict__["users"]
+        assert "events" not in work.__dict__
+        assert user.nickname == "lazy"
+    assert commits == []
+
+    async with uow as work:
+        await work.users.update(_id=user.id, data={"nickname": "renamed"})
+    assert commits == [1]
+
+    # FilterHeadler будується один раз на клас репозиторію
+    assert work.users._filter is work.__class__.repositories["users"]._filter
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_add_is_committed_by_unit_of_work_only(tmp_path):
+    engine, factory = await make_db(tmp_path / "atomic.db", "atomic")
+    uow = SqlAlchemyUnitOfWork(factory)
+
+    with pytest.raises(RuntimeError):
+        async with uow as work:
+            user = await work.users.add(
+                {"nickname": "ghost", "password": "12345678", "email": "ghost@test.com"}
+            )
+            await work.refresh_tokens.add({"token": "t", "user_id": user.id})
+            raise RuntimeError("fail after both inserts")
+
+    async with uow as work:
+        assert await work.users.find(email=eq("ghost@test.com")) is None
+        assert await work.refresh_tokens.find(token=eq("t")) is None
+    await engine.dispose()
@@ -0,0 +1,39 @@
+import timeit
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.database import engine as default_engine
+
+
+@contextmanager
+def count_queries(engine: AsyncEngine = default_engine):
+    """Збирає SQL, виконаний через engine, у список всередині блоку with."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def assert_num_queries(expected: int, engine: AsyncEngine = default_engine):
+    """Перевіряє, що код у блоці (сервіс чи ендпоінт) виконав рівно expected запитів."""
+    with count_queries(engine) as statements:
+        yield statements
+    assert len(statements) == expected, (
+        f"Expected {expected} queries, got {len(statements)}:\n"
+        + "\n".join(statements)
+    )
+
+
+def throughput(fn, number: int) -> float:
+    """Викликів fn за секунду; для тестів з міткою benchmark."""
+    return number / timeit.timeit(fn, number=number)